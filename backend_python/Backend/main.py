@@ -1,16 +1,22 @@
 from fastapi import UploadFile, File, Form
+import json
 import os
 import shutil
+import time
 
 from dotenv import load_dotenv
 load_dotenv()   # 🔐 This makes OPENAI_API_KEY visible inside venv
 
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
-from Backend.services.live_interview_engine import create_session, submit_answer
+from Backend.services.live_interview_engine import SESSIONS, create_session, stream_answer, submit_answer
 from Backend.services.resume_service import parse_resume
+from Backend.services.session_registry import StaleSessionError
+from llm_gateway import close_gateways
 
 
 # ---------------------------
@@ -19,6 +25,11 @@ from Backend.services.resume_service import parse_resume
 app = FastAPI()
 
 
+@app.on_event("shutdown")
+async def shutdown():
+    await close_gateways()
+
+
 # ---------------------------
 # CORS for React (Vite)
 # ---------------------------
@@ -74,15 +85,15 @@ class AnswerReq(BaseModel):
 # Start Interview
 # ---------------------------
 @app.post("/start-live-interview")
-def start_live(req: StartReq):
+async def start_live(req: StartReq):
     print("🚀 HireGen AI Engine Starting")
     print("🎯 Interview for user:", req.user_id)
 
-    # 1️⃣ Parse resume
-    resume_data = parse_resume(req.user_id)
+    # 1️⃣ Parse resume (PDF extraction is CPU-bound, keep it off the event loop)
+    resume_data = await run_in_threadpool(parse_resume, req.user_id)
 
     # 2️⃣ Create AI interview session
-    session_id, first_question = create_session(req.user_id, resume_data)
+    session_id, first_question = await create_session(req.user_id, resume_data)
 
     return {
         "session_id": session_id,
@@ -94,8 +105,12 @@ def start_live(req: StartReq):
 # Submit Answer
 # ---------------------------
 @app.post("/submit-live-answer")
-def submit_live(req: AnswerReq):
-    next_question, report = submit_answer(req.session_id, req.answer)
+async def submit_live(req: AnswerReq):
+    try:
+        next_question, report = await submit_answer(req.session_id, req.answer)
+    except StaleSessionError as e:
+        # another request (e.g. a client retry) answered this question first
+        raise HTTPException(status_code=409, detail=str(e))
 
     # Interview finished
     if report:
@@ -109,3 +124,45 @@ def submit_live(req: AnswerReq):
         "finished": False,
         "question": next_question
     }
+
+
+# ---------------------------
+# Submit Answer (streaming)
+# ---------------------------
+# Server-sent events:
+#   event: token  data: {"text": "..."}          one per model delta
+#   event: done   data: {"finished", "question" | "report", "ttft_ms", "total_ms"}
+#   event: error  data: {"error": "..."}
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.post("/submit-live-answer/stream")
+async def submit_live_stream(req: AnswerReq):
+    if not await run_in_threadpool(SESSIONS.__contains__, req.session_id):
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    async def events():
+        start = time.perf_counter()
+        ttft_ms = None
+        try:
+            async for kind, payload in stream_answer(req.session_id, req.answer):
+                if kind == "token":
+                    if ttft_ms is None:
+                        ttft_ms = round((time.perf_counter() - start) * 1000, 1)
+                        print(f"⚡ First token after {ttft_ms} ms")
+                    yield _sse("token", {"text": payload})
+                else:
+                    payload["ttft_ms"] = ttft_ms
+                    payload["total_ms"] = round((time.perf_counter() - start) * 1000, 1)
+                    yield _sse("done", payload)
+        except Exception as e:
+            print("❌ Streaming answer failed:", e)
+            yield _sse("error", {"error": str(e)})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # keep proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
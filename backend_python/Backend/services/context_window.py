@@ -0,0 +1,185 @@
+import json
+import os
+
+try:
+    import tiktoken
+except ImportError:  # fall back to a ~4 chars/token estimate
+    tiktoken = None
+
+# ================== CONTEXT WINDOW ==================
+#
+# Keeps the live interview prompt at a bounded size instead of resending the
+# whole history every turn:
+#
+#   system prompt                     fixed
+#   resume digest + "start"           fixed, capped at digest_tokens
+#   summary of earlier turns          updated incrementally, capped at summary_tokens
+#   recent Q/A turns                  verbatim
+#
+# Summarizing costs an extra LLM call before the next question, so turns are
+# only folded into the summary once the prompt exceeds `budget` tokens, and
+# then in one batch down to `fold_target` of the budget (never touching the
+# last keep_turns unless they alone are over budget). That leaves headroom for
+# the next few turns, so a fold happens every few turns rather than every
+# turn. All state lives in the session dict so it survives any session registry.
+
+CONTEXT_BUDGET = int(os.getenv("LIVE_CONTEXT_BUDGET", "3000"))
+CONTEXT_TURNS = int(os.getenv("LIVE_CONTEXT_TURNS", "4"))
+SUMMARY_TOKENS = int(os.getenv("LIVE_SUMMARY_TOKENS", "300"))
+DIGEST_TOKENS = int(os.getenv("LIVE_RESUME_DIGEST_TOKENS", "800"))
+# fraction of the budget a fold shrinks the prompt to
+FOLD_TARGET = float(os.getenv("LIVE_CONTEXT_FOLD_TARGET", "0.6"))
+
+# per-message framing tokens in the chat format
+MESSAGE_OVERHEAD = 4
+
+_warned_fallback = False
+
+SUMMARY_PROMPT = """
+Update the running summary of a job interview.
+
+Current summary:
+{summary}
+
+New question/answer turns:
+{turns}
+
+Return only the updated summary, at most {words} words: topics already covered,
+claims the candidate made, strengths and weak spots. No preamble.
+"""
+
+
+class TokenCounter:
+    def __init__(self, model="gpt-4o-mini"):
+        global _warned_fallback
+        self.encoding = None
+        if tiktoken is not None:
+            try:
+                self.encoding = tiktoken.encoding_for_model(model)
+            except KeyError:
+                self.encoding = tiktoken.get_encoding("o200k_base")
+        elif not _warned_fallback:
+            _warned_fallback = True
+            print("⚠️ tiktoken is not installed; estimating tokens as characters / 4")
+
+    def count(self, text):
+        if self.encoding is None:
+            return (len(text) + 3) // 4
+        return len(self.encoding.encode(text))
+
+    def count_messages(self, messages):
+        return sum(self.count(m["content"]) + MESSAGE_OVERHEAD for m in messages) + 2
+
+    def truncate(self, text, max_tokens, keep="head"):
+        """Cut `text` to `max_tokens`, keeping its start (head) or its end (tail)."""
+        if self.count(text) <= max_tokens:
+            return text
+        if self.encoding is None:
+            chars = max_tokens * 4
+            return text[:chars] if keep == "head" else text[-chars:]
+        tokens = self.encoding.encode(text)
+        tokens = tokens[:max_tokens] if keep == "head" else tokens[-max_tokens:]
+        return self.encoding.decode(tokens)
+
+
+def resume_digest(resume, counter, max_tokens=DIGEST_TOKENS):
+    """Compact JSON of the parsed resume without contact details, capped at max_tokens."""
+    if isinstance(resume, dict):
+        resume = {k: v for k, v in resume.items() if v and k not in ("contacts", "parse_mode", "raw_text")}
+        text = json.dumps(resume, ensure_ascii=False, separators=(",", ":"))
+    else:
+        text = str(resume)
+    return counter.truncate(text, max_tokens)
+
+
+def _render_turns(turns):
+    return "\n".join(f"Q: {t['question']}\nA: {t['answer']}" for t in turns)
+
+
+class ContextWindow:
+    def __init__(self, system_prompt, llm=None, model="gpt-4o-mini", budget=CONTEXT_BUDGET,
+                 keep_turns=CONTEXT_TURNS, summary_tokens=SUMMARY_TOKENS, digest_tokens=DIGEST_TOKENS,
+                 fold_target=FOLD_TARGET):
+        self.system_prompt = system_prompt
+        self.llm = llm
+        self.model = model
+        self.budget = budget
+        self.keep_turns = keep_turns
+        self.summary_tokens = summary_tokens
+        self.digest_tokens = digest_tokens
+        self.fold_target = fold_target
+        self.counter = TokenCounter(model)
+
+    def start(self, session, resume):
+        session["digest"] = resume_digest(resume, self.counter, self.digest_tokens)
+        session["turns"] = []
+        session["summary"] = ""
+        session["summarized_turns"] = 0
+
+    def _build(self, session, first_verbatim):
+        messages = [
+            {"role": "system", "content": self.system_prompt},
+            {"role": "user", "content": f"Candidate resume:\n{session['digest']}\nStart the interview."},
+        ]
+        if session["summary"]:
+            messages.append({"role": "system", "content": f"Summary of the interview so far:\n{session['summary']}"})
+        for turn in session["turns"][first_verbatim:]:
+            messages.append({"role": "assistant", "content": turn["question"]})
+            messages.append({"role": "user", "content": turn["answer"]})
+        return messages
+
+    async def messages(self, session):
+        """Prompt for the next question; folds old turns into the summary when over budget (mutates `session`)."""
+        if "digest" not in session:
+            # session created before the context window existed
+            session["digest"] = resume_digest(session.get("resume", ""), self.counter, self.digest_tokens)
+        turns = session.setdefault("turns", [])
+        session.setdefault("summary", "")
+        first = session.setdefault("summarized_turns", 0)
+        messages = self._build(session, first)
+
+        if self.counter.count_messages(messages) > self.budget:
+            target = int(self.budget * self.fold_target)
+            fold_to = first
+            # fold down to the target, then only into the last keep_turns while still over
+            # budget; the newest turn always stays verbatim, even if it alone blows the budget
+            while fold_to < len(turns) - 1:
+                limit = target if fold_to < len(turns) - self.keep_turns else self.budget
+                if self.counter.count_messages(self._build(session, fold_to)) <= limit:
+                    break
+                fold_to += 1
+
+            if fold_to > first:
+                await self._fold(session, turns[first:fold_to])
+                session["summarized_turns"] = fold_to
+                messages = self._build(session, fold_to)
+
+        session["context_tokens"] = self.counter.count_messages(messages)
+        return messages
+
+    async def _fold(self, session, turns):
+        summary = ""
+        if self.llm is not None:
+            prompt = SUMMARY_PROMPT.format(
+                summary=session["summary"] or "(none yet)",
+                turns=_render_turns(turns),
+                words=int(self.summary_tokens * 0.7),
+            )
+            try:
+                summary = await self.llm.achat(
+                    [{"role": "user", "content": prompt}],
+                    model=self.model,
+                    temperature=0,
+                    max_tokens=self.summary_tokens,
+                )
+            except Exception as e:
+                print("⚠️ Summarizing interview turns failed, keeping them in short form:", e)
+
+        if not summary:
+            short = "\n".join(
+                f"- Q: {self.counter.truncate(t['question'], 40)} A: {self.counter.truncate(t['answer'], 60)}"
+                for t in turns
+            )
+            summary = f"{session['summary']}\n{short}".strip()
+
+        session["summary"] = self.counter.truncate(summary.strip(), self.summary_tokens, keep="tail")
@@ -1,12 +1,17 @@
+import asyncio
 import uuid
 import os
 import json
+import sqlite3
 from typing import List, Dict, Any
-from groq import Groq
 from dotenv import load_dotenv
 
 load_dotenv()
 
+from llm_gateway import get_gateway
+from Backend.services.session_registry import StaleSessionError
+from Backend.services.session_store import SessionStore
+
 # ================== ENV + PATHS ==================
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -16,7 +21,10 @@ UPLOAD_DIR = os.path.join(BASE_DIR, "uploads")
 os.makedirs(SESSION_DIR, exist_ok=True)
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
-client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+SESSION_DB = os.getenv("INTERVIEW_SESSION_DB", os.path.join(SESSION_DIR, "sessions.db"))
+
+llm = get_gateway("groq")
+store = SessionStore(SESSION_DB)
 
 # ================== PROMPTS ==================
 
@@ -60,35 +68,44 @@ Return ONLY valid JSON:
 def _session_path(session_id):
     return os.path.join(SESSION_DIR, f"{session_id}.json")
 
-def _save(session):
-    with open(_session_path(session["session_id"]), "w", encoding="utf-8") as f:
-        json.dump(session, f, indent=2)
-
 def _load(session_id):
-    path = _session_path(session_id)
-    if not os.path.exists(path):
-        raise FileNotFoundError("Session not found")
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    # sessions written as JSON files before the SQLite store are imported on first access
+    if not store.exists(session_id):
+        path = _session_path(session_id)
+        if not os.path.exists(path):
+            raise FileNotFoundError("Session not found")
+        with open(path, "r", encoding="utf-8") as f:
+            legacy = json.load(f)
+        try:
+            store.create(legacy)
+        except sqlite3.IntegrityError:
+            pass  # another worker imported it first
+    return store.load(session_id)
+
+
+def _append_and_load(session_id, question_id, answer_text, report=None, expect_index=None):
+    """Returns (written, session after the write attempt)."""
+    written = store.append_answer(session_id, question_id, answer_text, report, expect_index=expect_index)
+    return written, store.load(session_id)
 
 # ================== CORE LOGIC ==================
 
-def generate_questions(parsed_resume: dict, n=8):
+async def generate_questions(parsed_resume: dict, n=8):
     prompt = QUESTION_PROMPT.format(
         resume=json.dumps(parsed_resume, indent=2),
         n=n
     )
 
-    res = client.chat.completions.create(
-        model="llama-3.3-70b-versatile",
-        messages=[
+    res = await llm.achat(
+        [
             {"role": "system", "content": "You generate structured interview questions"},
             {"role": "user", "content": prompt}
         ],
+        model="llama-3.3-70b-versatile",
         temperature=0
     )
 
-    raw = res.choices[0].message.content.strip()
+    raw = res.strip()
 
     import re
     m = re.search(r"\[.*\]", raw, re.DOTALL)
@@ -96,8 +113,8 @@ def generate_questions(parsed_resume: dict, n=8):
 
 # ================== API FUNCTIONS ==================
 
-def create_interview_session(user_id, parsed_resume, num_questions=8):
-    questions = generate_questions(parsed_resume, num_questions)
+async def create_interview_session(user_id, parsed_resume, num_questions=8):
+    questions = await generate_questions(parsed_resume, num_questions)
 
     session = {
         "session_id": str(uuid.uuid4()),
@@ -110,33 +127,41 @@ def create_interview_session(user_id, parsed_resume, num_questions=8):
         "report": None
     }
 
-    _save(session)
+    # sqlite calls run in a worker thread so they never block the event loop
+    await asyncio.to_thread(store.create, session)
     return session
 
 
-def load_session(session_id):
-    return _load(session_id)
+async def load_session(session_id):
+    return await asyncio.to_thread(_load, session_id)
 
 
-def save_answer(session_id, question_id, answer_text):
-    session = _load(session_id)
+async def save_answer(session_id, question_id, answer_text):
+    """
+    Record the answer to the current question. Raises StaleSessionError if
+    another request (e.g. a client retry) answered that question first.
+    """
+    session = await asyncio.to_thread(_load, session_id)
+    if session["finished"]:
+        return session
+    expect_index = session["current_index"]
 
-    session["answers"].append({
-        "question_id": question_id,
-        "answer": answer_text
-    })
+    report = None
+    if expect_index + 1 >= len(session["questions"]):
+        # last answer: generate the report first and commit answer + report
+        # together, so a failed report saves nothing and the client can retry
+        pending = dict(session, answers=session["answers"] + [{"question_id": question_id, "answer": answer_text}])
+        report = await generate_report_for_session(pending)
 
-    session["current_index"] += 1
-
-    if session["current_index"] >= len(session["questions"]):
-        session["finished"] = True
-        session["report"] = generate_report_for_session(session)
-
-    _save(session)
+    written, session = await asyncio.to_thread(
+        _append_and_load, session_id, question_id, answer_text, report, expect_index
+    )
+    if not written:
+        raise StaleSessionError(f"Question {expect_index} of session {session_id} was already answered")
     return session
 
 
-def generate_report_for_session(session):
+async def generate_report_for_session(session):
     qa = []
     for i, q in enumerate(session["questions"]):
         ans = ""
@@ -149,16 +174,16 @@ def generate_report_for_session(session):
         qa="\n".join(qa)
     )
 
-    res = client.chat.completions.create(
-        model="llama-3.3-70b-versatile",
-        messages=[
+    res = await llm.achat(
+        [
             {"role": "system", "content": "You are an expert hiring manager"},
             {"role": "user", "content": prompt}
         ],
+        model="llama-3.3-70b-versatile",
         temperature=0
     )
 
-    raw = res.choices[0].message.content.strip()
+    raw = res.strip()
 
     import re
     m = re.search(r"\{.*\}", raw, re.DOTALL)
@@ -1,11 +1,21 @@
-import uuid
-from typing import Dict, List
-from openai import OpenAI
+import asyncio
+import copy
 import os
+import uuid
+from typing import List
+from llm_gateway import get_gateway
+from Backend.services.context_window import ContextWindow
+from Backend.services.session_registry import make_registry
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+llm = get_gateway("openai")
 
-SESSIONS: Dict[str, dict] = {}
+# memory by default; set LIVE_SESSION_BACKEND=sqlite:///path or redis://host to share across workers
+SESSIONS = make_registry()
+
+MODEL = "gpt-4o-mini"
+MAX_ANSWERS = 10
+# questions are one or two sentences; this caps the completion side of each turn
+QUESTION_MAX_TOKENS = int(os.getenv("LIVE_QUESTION_MAX_TOKENS", "200"))
 
 SYSTEM_PROMPT = """
 You are HireGen-AI, a professional technical interviewer.
@@ -15,51 +25,96 @@ Never repeat questions.
 Be concise and professional.
 """
 
-def create_session(user_id: str, resume_text: str):
+context = ContextWindow(SYSTEM_PROMPT, llm=llm, model=MODEL)
+
+
+async def create_session(user_id: str, resume_text: str):
     session_id = str(uuid.uuid4())
 
-    SESSIONS[session_id] = {
+    session = {
         "user_id": user_id,
         "resume": resume_text,
-        "messages": [
-            {"role": "system", "content": SYSTEM_PROMPT},
-            {"role": "user", "content": f"Candidate resume:\n{resume_text}\nStart the interview."}
-        ],
         "answers": [],
         "finished": False
     }
+    context.start(session, resume_text)
 
-    first_question = ask_llm(SESSIONS[session_id]["messages"])
+    first_question = await ask_llm(await context.messages(session))
+    session["question"] = first_question
+    # registry reads/writes may hit sqlite or redis; keep them off the event loop
+    await asyncio.to_thread(SESSIONS.put, session_id, session)
     return session_id, first_question
 
 
-def ask_llm(messages):
-    r = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=messages,
-        temperature=0.6
+async def ask_llm(messages, max_tokens=None):
+    return await llm.achat(
+        messages,
+        model=MODEL,
+        temperature=0.6,
+        max_tokens=max_tokens
     )
-    return r.choices[0].message.content
-
 
-def submit_answer(session_id: str, answer: str):
-    session = SESSIONS[session_id]
 
-    session["messages"].append({"role": "user", "content": answer})
+def _record_answer(session, answer):
     session["answers"].append(answer)
+    # sessions created before the context window have no "turns" yet
+    session.setdefault("turns", []).append({"question": session.get("question", ""), "answer": answer})
+
+
+async def submit_answer(session_id: str, answer: str):
+    session = await asyncio.to_thread(SESSIONS.__getitem__, session_id)
+    _record_answer(session, answer)
 
     # Stop after 10 answers
-    if len(session["answers"]) >= 10:
+    if len(session["answers"]) >= MAX_ANSWERS:
         session["finished"] = True
-        return None, generate_report(session)
+        report = await generate_report(session)
+        await asyncio.to_thread(SESSIONS.put, session_id, session)
+        return None, report
 
-    question = ask_llm(session["messages"])
+    question = await ask_llm(await context.messages(session), QUESTION_MAX_TOKENS)
+    session["question"] = question
+    await asyncio.to_thread(SESSIONS.put, session_id, session)
     return question, None
 
 
-def generate_report(session):
-    messages = [
+async def stream_answer(session_id: str, answer: str):
+    """
+    Streaming variant of submit_answer. Yields ("token", text) while the next
+    question (or the final report) is generated, then ("done", result) with
+    result = {"finished": bool, "question" | "report": full text}.
+
+    The session is only updated once the stream completes, so a dropped
+    connection leaves it as it was and the answer can be resubmitted.
+    """
+    session = copy.deepcopy(await asyncio.to_thread(SESSIONS.__getitem__, session_id))
+    _record_answer(session, answer)
+    finished = len(session["answers"]) >= MAX_ANSWERS
+
+    if finished:
+        prompt, max_tokens = report_messages(session["resume"], session["answers"]), None
+    else:
+        prompt, max_tokens = await context.messages(session), QUESTION_MAX_TOKENS
+
+    parts = []
+    async for token in llm.astream(prompt, model=MODEL, temperature=0.6, max_tokens=max_tokens):
+        parts.append(token)
+        yield "token", token
+    text = "".join(parts)
+
+    session["finished"] = finished
+    if not finished:
+        session["question"] = text
+    await asyncio.to_thread(SESSIONS.put, session_id, session)
+    yield "done", {"finished": True, "report": text} if finished else {"finished": False, "question": text}
+
+
+def report_messages(resume, answers):
+    return [
         {"role": "system", "content": "You are an HR evaluator."},
-        {"role": "user", "content": f"Resume:\n{session['resume']}\nAnswers:\n{session['answers']}\nGenerate a hiring report."}
+        {"role": "user", "content": f"Resume:\n{resume}\nAnswers:\n{answers}\nGenerate a hiring report."}
     ]
-    return ask_llm(messages)
+
+
+async def generate_report(session):
+    return await ask_llm(report_messages(session["resume"], session["answers"]))
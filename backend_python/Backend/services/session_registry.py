@@ -0,0 +1,248 @@
+import copy
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+from Backend.services.session_store import connect
+
+# ================== LIVE SESSION REGISTRY ==================
+#
+# Where live_interview_engine keeps its in-flight sessions. All backends
+# expose get / put / delete (plus dict-style access) and evict sessions that
+# have been idle longer than `ttl`, or finished longer than `finished_ttl`.
+#
+#   memory          - per-process LRU with a session count and byte cap
+#   sqlite:///path  - one table in a WAL database shared by all workers
+#   redis://...     - any Redis-compatible server (needs the redis package)
+#
+# With more than one uvicorn worker a shared backend is required, since a
+# follow-up request can land on a different process.
+#
+# Writes are optimistic: every session carries a "version" that put() bumps,
+# and put() raises StaleSessionError if the stored copy has moved on since
+# the caller read it (e.g. a retried submit racing the original), instead of
+# silently dropping the other writer's answer.
+
+DEFAULT_TTL = 2 * 60 * 60
+DEFAULT_FINISHED_TTL = 10 * 60
+
+
+class StaleSessionError(RuntimeError):
+    """The session was changed by another request since it was read."""
+
+
+def _size(session):
+    return len(json.dumps(session))
+
+
+def _next_version(session_id, session, stored_version):
+    """The version to write `session` with; raises if the stored copy is not the one it was read from."""
+    expected = session.get("version", 0)
+    if stored_version is not None and stored_version != expected:
+        raise StaleSessionError(f"Session {session_id} was updated concurrently")
+    return expected + 1
+
+
+class SessionRegistry(ABC):
+    def __init__(self, ttl=DEFAULT_TTL, finished_ttl=DEFAULT_FINISHED_TTL):
+        self.ttl = ttl
+        self.finished_ttl = finished_ttl
+
+    @abstractmethod
+    def get(self, session_id):
+        """The stored session (a copy the caller may modify), or None."""
+
+    @abstractmethod
+    def put(self, session_id, session):
+        """Store `session`; raises StaleSessionError if it was changed since it was read."""
+
+    @abstractmethod
+    def delete(self, session_id):
+        """Remove the session if it exists."""
+
+    def _ttl_for(self, session):
+        return self.finished_ttl if session.get("finished") else self.ttl
+
+    def __getitem__(self, session_id):
+        session = self.get(session_id)
+        if session is None:
+            raise KeyError(session_id)
+        return session
+
+    def __setitem__(self, session_id, session):
+        self.put(session_id, session)
+
+    def __delitem__(self, session_id):
+        self.delete(session_id)
+
+    def __contains__(self, session_id):
+        return self.get(session_id) is not None
+
+
+class MemoryRegistry(SessionRegistry):
+    """In-process LRU. Beyond max_sessions / max_bytes the least recently used sessions are dropped."""
+
+    def __init__(self, ttl=DEFAULT_TTL, finished_ttl=DEFAULT_FINISHED_TTL, max_sessions=1000,
+                 max_bytes=64 * 1024 * 1024):
+        super().__init__(ttl, finished_ttl)
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.evictions = 0
+        self._sessions = OrderedDict()  # session_id -> (session, size, expires_at)
+        self._bytes = 0
+
+    def get(self, session_id):
+        with self.lock:
+            self._expire(time.time())
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return None
+            self._sessions.move_to_end(session_id)
+            # callers get their own copy, like the shared backends
+            return copy.deepcopy(entry[0])
+
+    def put(self, session_id, session):
+        now = time.time()
+        with self.lock:
+            current = self._sessions.get(session_id)
+            version = _next_version(session_id, session, current[0].get("version", 0) if current else None)
+            stored = copy.deepcopy({**session, "version": version})
+            size = _size(stored)
+            self._drop(session_id)
+            self._sessions[session_id] = (stored, size, now + self._ttl_for(session))
+            self._bytes += size
+            session["version"] = version
+            self._expire(now)
+            while len(self._sessions) > 1 and (
+                len(self._sessions) > self.max_sessions or self._bytes > self.max_bytes
+            ):
+                self._drop(next(iter(self._sessions)))
+                self.evictions += 1
+
+    def delete(self, session_id):
+        with self.lock:
+            self._drop(session_id)
+
+    def _drop(self, session_id):
+        entry = self._sessions.pop(session_id, None)
+        if entry:
+            self._bytes -= entry[1]
+
+    def _expire(self, now):
+        for session_id in [sid for sid, (_, _, expires) in self._sessions.items() if expires <= now]:
+            self._drop(session_id)
+            self.evictions += 1
+
+    def stats(self):
+        with self.lock:
+            return {"sessions": len(self._sessions), "bytes": self._bytes, "evictions": self.evictions}
+
+
+class SqliteRegistry(SessionRegistry):
+    """Sessions as JSON rows in a WAL database file that every worker opens."""
+
+    def __init__(self, path, ttl=DEFAULT_TTL, finished_ttl=DEFAULT_FINISHED_TTL, max_sessions=10000):
+        super().__init__(ttl, finished_ttl)
+        self.path = path
+        self.max_sessions = max_sessions
+        self._local = threading.local()
+        db = self._conn()
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS live_sessions ("
+            " session_id TEXT PRIMARY KEY, body TEXT NOT NULL, expires_at REAL NOT NULL, used_at REAL NOT NULL,"
+            " version INTEGER NOT NULL DEFAULT 0)"
+        )
+        columns = {row["name"] for row in db.execute("PRAGMA table_info(live_sessions)")}
+        if "version" not in columns:
+            db.execute("ALTER TABLE live_sessions ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = connect(self.path)
+        return conn
+
+    def get(self, session_id):
+        now = time.time()
+        db = self._conn()
+        row = db.execute(
+            "SELECT body FROM live_sessions WHERE session_id = ? AND expires_at > ?", (session_id, now)
+        ).fetchone()
+        return json.loads(row["body"]) if row else None
+
+    def put(self, session_id, session):
+        now = time.time()
+        db = self._conn()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            row = db.execute("SELECT version FROM live_sessions WHERE session_id = ?", (session_id,)).fetchone()
+            version = _next_version(session_id, session, row["version"] if row else None)
+            db.execute(
+                "INSERT OR REPLACE INTO live_sessions (session_id, body, expires_at, used_at, version)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (session_id, json.dumps({**session, "version": version}), now + self._ttl_for(session), now, version),
+            )
+            db.execute("DELETE FROM live_sessions WHERE expires_at <= ?", (now,))
+            db.execute(
+                "DELETE FROM live_sessions WHERE session_id IN ("
+                " SELECT session_id FROM live_sessions ORDER BY used_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_sessions,),
+            )
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+        session["version"] = version
+
+    def delete(self, session_id):
+        self._conn().execute("DELETE FROM live_sessions WHERE session_id = ?", (session_id,))
+
+
+class RedisRegistry(SessionRegistry):
+    """Sessions as JSON strings with a server-side expiry; the server's maxmemory policy caps memory."""
+
+    def __init__(self, url, ttl=DEFAULT_TTL, finished_ttl=DEFAULT_FINISHED_TTL, prefix="live-session:"):
+        import redis
+
+        super().__init__(ttl, finished_ttl)
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self._watch_error = redis.WatchError
+
+    def get(self, session_id):
+        raw = self.client.get(self.prefix + session_id)
+        return json.loads(raw) if raw else None
+
+    def put(self, session_id, session):
+        key = self.prefix + session_id
+        with self.client.pipeline() as pipe:
+            try:
+                # WATCH + MULTI: the SET only applies if nobody wrote the key in between
+                pipe.watch(key)
+                raw = pipe.get(key)
+                version = _next_version(session_id, session, json.loads(raw).get("version", 0) if raw else None)
+                pipe.multi()
+                pipe.set(key, json.dumps({**session, "version": version}), ex=int(self._ttl_for(session)))
+                pipe.execute()
+            except self._watch_error:
+                raise StaleSessionError(f"Session {session_id} was updated concurrently")
+        session["version"] = version
+
+    def delete(self, session_id):
+        self.client.delete(self.prefix + session_id)
+
+
+def make_registry(url=None, **options):
+    """Build a registry from a backend URL (default: $LIVE_SESSION_BACKEND or "memory")."""
+    url = url or os.getenv("LIVE_SESSION_BACKEND", "memory")
+    if url == "memory":
+        return MemoryRegistry(**options)
+    if url.startswith("sqlite:///"):
+        return SqliteRegistry(url[len("sqlite:///"):], **options)
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisRegistry(url, **options)
+    raise ValueError(f"Unknown session backend {url!r}; use memory, sqlite:///path or redis://host")
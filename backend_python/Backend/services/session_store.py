@@ -0,0 +1,201 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+# ================== SQLITE SESSION STORE ==================
+#
+# Interview sessions as rows instead of one JSON document per session:
+# saving an answer is a single-row INSERT plus a counter UPDATE in one
+# transaction, the parsed resume is stored once per distinct content and
+# referenced by hash, and WAL mode lets readers run alongside a writer from
+# other threads or uvicorn worker processes.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS resumes (
+    hash TEXT PRIMARY KEY,
+    body TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    user_id TEXT,
+    resume_hash TEXT REFERENCES resumes(hash),
+    num_questions INTEGER NOT NULL,
+    current_index INTEGER NOT NULL DEFAULT 0,
+    finished INTEGER NOT NULL DEFAULT 0,
+    report TEXT,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS questions (
+    session_id TEXT NOT NULL REFERENCES sessions(session_id),
+    idx INTEGER NOT NULL,
+    body TEXT NOT NULL,
+    PRIMARY KEY (session_id, idx)
+);
+CREATE TABLE IF NOT EXISTS answers (
+    session_id TEXT NOT NULL REFERENCES sessions(session_id),
+    idx INTEGER NOT NULL,
+    question_id TEXT,
+    answer TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (session_id, idx)
+);
+"""
+
+
+def connect(path, timeout=10.0):
+    """Autocommit connection in WAL mode; callers issue BEGIN themselves."""
+    conn = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    return conn
+
+
+def resume_hash(parsed_resume) -> str:
+    canonical = json.dumps(parsed_resume, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+class SessionStore:
+    """
+    One connection per thread; every write runs in a BEGIN IMMEDIATE
+    transaction so concurrent workers serialize on the database lock
+    (waiting up to `timeout` seconds) instead of overwriting each other.
+    """
+
+    def __init__(self, path, timeout=10.0):
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        self._conn().executescript(SCHEMA)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = connect(self.path, self.timeout)
+        return conn
+
+    def _tx(self):
+        return _Transaction(self._conn())
+
+    # ---------------- writes ----------------
+
+    def create(self, session):
+        digest = resume_hash(session["parsed_resume"])
+        with self._tx() as db:
+            db.execute(
+                "INSERT OR IGNORE INTO resumes (hash, body) VALUES (?, ?)",
+                (digest, json.dumps(session["parsed_resume"])),
+            )
+            db.execute(
+                "INSERT INTO sessions (session_id, user_id, resume_hash, num_questions, current_index,"
+                " finished, report, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    session["session_id"], session["user_id"], digest, len(session["questions"]),
+                    session["current_index"], int(session["finished"]),
+                    json.dumps(session["report"]) if session["report"] is not None else None, time.time(),
+                ),
+            )
+            db.executemany(
+                "INSERT INTO questions (session_id, idx, body) VALUES (?, ?, ?)",
+                [(session["session_id"], i, json.dumps(q)) for i, q in enumerate(session["questions"])],
+            )
+            db.executemany(
+                "INSERT INTO answers (session_id, idx, question_id, answer, created_at) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (session["session_id"], i, a.get("question_id"), a["answer"], time.time())
+                    for i, a in enumerate(session["answers"])
+                ],
+            )
+
+    def append_answer(self, session_id, question_id, answer_text, report=None, expect_index=None):
+        """
+        Record the answer to the current question and advance the index.
+
+        The last answer finishes the session and must come with its `report`,
+        so answer and report are committed together. Returns False without
+        writing if the session is finished, if `expect_index` no longer
+        matches the current index, or if this is the last answer and no
+        report was given.
+        """
+        with self._tx() as db:
+            row = db.execute(
+                "SELECT current_index, num_questions, finished FROM sessions WHERE session_id = ?",
+                (session_id,),
+            ).fetchone()
+            if row is None:
+                raise FileNotFoundError("Session not found")
+            if row["finished"] or (expect_index is not None and row["current_index"] != expect_index):
+                return False
+            finished = row["current_index"] + 1 >= row["num_questions"]
+            if finished and report is None:
+                return False
+
+            db.execute(
+                "INSERT INTO answers (session_id, idx, question_id, answer, created_at) VALUES (?, ?, ?, ?, ?)",
+                (session_id, row["current_index"], question_id, answer_text, time.time()),
+            )
+            db.execute(
+                "UPDATE sessions SET current_index = current_index + 1, finished = ?, report = ?"
+                " WHERE session_id = ?",
+                (int(finished), json.dumps(report) if finished else None, session_id),
+            )
+            return True
+
+    # ---------------- reads ----------------
+
+    def exists(self, session_id):
+        db = self._conn()
+        return db.execute("SELECT 1 FROM sessions WHERE session_id = ?", (session_id,)).fetchone() is not None
+
+    def load(self, session_id):
+        db = self._conn()
+        # one read transaction so the session row, questions and answers are a consistent snapshot
+        db.execute("BEGIN")
+        try:
+            return self._load(db, session_id)
+        finally:
+            db.execute("COMMIT")
+
+    def _load(self, db, session_id):
+        row = db.execute(
+            "SELECT s.*, r.body AS resume FROM sessions s LEFT JOIN resumes r ON r.hash = s.resume_hash"
+            " WHERE s.session_id = ?",
+            (session_id,),
+        ).fetchone()
+        if row is None:
+            raise FileNotFoundError("Session not found")
+
+        questions = db.execute(
+            "SELECT body FROM questions WHERE session_id = ? ORDER BY idx", (session_id,)
+        ).fetchall()
+        answers = db.execute(
+            "SELECT question_id, answer FROM answers WHERE session_id = ? ORDER BY idx", (session_id,)
+        ).fetchall()
+
+        return {
+            "session_id": row["session_id"],
+            "user_id": row["user_id"],
+            "parsed_resume": json.loads(row["resume"]) if row["resume"] else {},
+            "questions": [json.loads(q["body"]) for q in questions],
+            "answers": [{"question_id": a["question_id"], "answer": a["answer"]} for a in answers],
+            "current_index": row["current_index"],
+            "finished": bool(row["finished"]),
+            "report": json.loads(row["report"]) if row["report"] else None,
+        }
+
+
+class _Transaction:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
@@ -4,25 +4,170 @@
 
 import random
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 import os
 from resume.OCR import process_resume
-from text_to_voice.audio_gen import run_audio, transcribe_audio
+from text_to_voice.audio_gen import Microphone, get_recognizer_pool, listen_and_transcribe
 from main_questions_interviewer.main import conversational_interviewer
-from face_for_interviewer.main import run_vision_module
+from face_for_interviewer.evidence import write_clip
+from face_for_interviewer.main import preload_vision_models, run_vision_module
 from voice_for_interviewer.voice import VoiceEngine
 from report_genrater.main import create_interview_report
 from email_system.main import send_interview_emails
 
 load_dotenv()
 
+CANCEL_LINE = "The interview has been canceled due to your non serious behaviour."
+FAREWELL_LINE = "Thanks for your time, see you again!"
+VISION_START_TIMEOUT = 60.0
+EVIDENCE_DIR = os.getenv("EVIDENCE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "evidence"))
+
+
+class TurnPipeline:
+    """
+    Overlaps the stages of an interview turn instead of running
+    speak -> open mic -> record -> transcribe -> LLM back to back:
+
+    - the microphone and the ASR model are opened in the background while
+      the first question is generated, and the mic stays armed between turns
+    - the question is spoken asynchronously; recording starts the moment
+      playback ends
+    - the transcript is produced while the candidate talks (streaming ASR)
+      and the next LLM call is submitted as soon as it is final
+
+    Per-stage and end-to-end timings are kept in `timings`.
+    """
+
+    def __init__(self, voice, structured_json, conversation_history, max_turns, stop_event):
+        self.voice = voice
+        self.structured_json = structured_json
+        self.conversation_history = conversation_history
+        self.max_turns = max_turns
+        self.stop_event = stop_event
+        self.timings = []
+
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="turn")
+        self._mic = self._executor.submit(Microphone)
+        self._executor.submit(self._warm_asr)
+        self._next = None
+        self._submitted_at = None
+        self._transcript_at = None
+
+    def _warm_asr(self):
+        pool = get_recognizer_pool()
+        pool.release(pool.acquire())
+
+    def prefetch_question(self):
+        """Start generating the next interviewer line from the current history."""
+        self._submitted_at = time.perf_counter()
+        self._next = self._executor.submit(
+            conversational_interviewer,
+            self.structured_json,
+            list(self.conversation_history),
+            self.max_turns,
+        )
+
+    def next_question(self):
+        if self._next is None:
+            self.prefetch_question()
+        line = self._next.result()
+        ready_at = time.perf_counter()
+        self._next = None
+
+        if self.timings:
+            last = self.timings[-1]
+            last["llm"] = ready_at - self._submitted_at
+            # silence the candidate hears between finishing and the next question
+            last["gap"] = ready_at - self._transcript_at
+            last["total"] = ready_at - last["started_at"]
+        return line
+
+    def run_turn(self, interviewer_line, prefetch=True):
+        started_at = time.perf_counter()
+        spoken = self.voice.speak_async(interviewer_line)
+        mic = self._mic.result()
+        try:
+            spoken.result()
+        except Exception as e:
+            print("⚠️ TTS failed:", e)
+        listen_at = time.perf_counter()
+
+        candidate_reply = listen_and_transcribe(self.stop_event, mic=mic)
+        self._transcript_at = time.perf_counter()
+
+        self.conversation_history.append({
+            "interviewer": interviewer_line,
+            "candidate": candidate_reply
+        })
+        if prefetch and not self.stop_event.is_set():
+            self.prefetch_question()
+
+        self.timings.append({
+            "turn": len(self.timings) + 1,
+            "started_at": started_at,
+            "speak": listen_at - started_at,
+            "listen": self._transcript_at - listen_at,
+        })
+        return candidate_reply
+
+    def report(self):
+        stages = ("speak", "listen", "llm", "gap", "total")
+        print("⏱️ Turn latency (seconds):")
+        print("turn " + " ".join(f"{s:>7}" for s in stages))
+        for t in self.timings:
+            print(f"{t['turn']:>4} " + " ".join(
+                f"{t[s]:7.2f}" if s in t else f"{'-':>7}" for s in stages
+            ))
+        gaps = [t["gap"] for t in self.timings if "gap" in t]
+        if gaps:
+            print(f"avg answer->question gap: {sum(gaps) / len(gaps):.2f}s")
+
+    def close(self):
+        if self._mic.done() and not self._mic.exception():
+            self._mic.result().close()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def attach_evidence(warnings, clips, out_dir):
+    """
+    Write each warning's clip (.avi) and full-size still (.jpg) to out_dir and
+    return the warnings with the files they refer to appended. Clips are
+    matched to warnings in order by reason; warnings without one are kept as-is.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    pending = list(clips)
+    attached = []
+    for warning in warnings:
+        if not pending or pending[0]["reason"] != warning:
+            attached.append(warning)
+            continue
+        clip = pending.pop(0)
+        stem = os.path.join(out_dir, f"warning_{len(clips) - len(pending):02d}")
+        files = []
+        if clip["still"]:
+            with open(stem + ".jpg", "wb") as f:
+                f.write(clip["still"])
+            files.append(stem + ".jpg")
+        if write_clip(clip, stem + ".avi"):
+            files.append(stem + ".avi")
+        note = ", truncated" if clip["truncated"] else ""
+        attached.append(f"{warning} (evidence: {', '.join(files)}{note})" if files else warning)
+    return attached
+
+
 def run_interview():
     voice = VoiceEngine()
+    voice.prewarm([CANCEL_LINE, FAREWELL_LINE])
 
     conversation_history = []
     turns = 0
     max_turns = random.randint(15, 18)
 
+    # vision models load while the resume is parsed
+    preload_vision_models()
+
     pdf_path = r"D:\FYP-II\HIREGEN-AI\backend_python\resume\MyCV.pdf"
     
     _, structured_json = process_resume(pdf_path)
@@ -44,49 +189,66 @@ def run_interview():
     )
     vision_thread.start()
 
+    pipeline = TurnPipeline(
+        voice,
+        structured_json,
+        conversation_history,
+        max_turns,
+        stop_event
+    )
+    # mic, ASR and the first question warm up while the camera and models load
+    pipeline.prefetch_question()
+
+    # no interview without proctoring: wait for camera + models before the
+    # first turn, abort if they fail
+    try:
+        detector.ready.result(timeout=VISION_START_TIMEOUT)
+    except Exception as e:
+        stop_event.set()
+        vision_thread.join()
+        pipeline.close()
+        voice.close()
+        raise RuntimeError(f"Vision module failed to start: {e}") from e
+
     try:
         while turns < max_turns and not stop_event.is_set():
-            interviewer_line = conversational_interviewer(
-                structured_json,
-                conversation_history,
-                max_turns
-            )
+            interviewer_line = pipeline.next_question()
 
             if interviewer_line == "Bye":
                 stop_event.set()
                 break
 
             print(interviewer_line)
-            voice.speak(interviewer_line)
             print("🎙️ Recording candidate reply...")
-            final_audio = run_audio()
+            candidate_reply = pipeline.run_turn(
+                interviewer_line,
+                prefetch=turns + 1 < max_turns
+            )
 
             print("✅ Audio recorded")
-
-            candidate_reply = transcribe_audio(final_audio)
             print("Candidate:", candidate_reply)
 
-            conversation_history.append({
-                "interviewer": interviewer_line,
-                "candidate": candidate_reply
-            })
-
             turns += 1
 
         if stop_event.is_set():
-            voice.speak(
-                "The interview has been canceled due to your non serious behaviour."
-            )
+            voice.speak_async(CANCEL_LINE)
 
     finally:
         stop_event.set()
         vision_thread.join()
+        pipeline.close()
+        pipeline.report()
 
-    voice.speak("Thanks for your time, see you again!")
+    # farewell plays while the report is built and mailed
+    voice.speak_async(FAREWELL_LINE)
 
 
     frame_bytes = getattr(detector, "latest_frame_bytes", None)
     warnings = getattr(detector, "warnings", [])
+    clips = getattr(detector, "evidence_clips", [])
+    if clips:
+        evidence_dir = os.path.join(EVIDENCE_DIR, time.strftime("%Y%m%d-%H%M%S"))
+        warnings = attach_evidence(warnings, clips, evidence_dir)
 
     print("Collected warnings:", warnings)
 
@@ -111,6 +273,9 @@ def run_interview():
         candidate_email=candidate_email
     )
 
+    voice.wait()
+    voice.close()
+
 
 if __name__ == "__main__":
     print("🚀 Controller started")
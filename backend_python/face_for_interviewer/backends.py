@@ -0,0 +1,155 @@
+import ast
+import os
+
+import cv2
+import numpy as np
+
+# ------------------------------------------------------------------
+# OBJECT DETECTION BACKENDS
+# ------------------------------------------------------------------
+# Both backends return a list of (class_name, confidence, (x1, y1, x2, y2))
+# in frame pixel coordinates, already filtered to the classes we care about.
+
+DEFAULT_WEIGHTS = "yolov8n.pt"
+
+
+class UltralyticsBackend:
+    """The original PyTorch path, restricted to the wanted classes and an optional input size."""
+
+    def __init__(self, weights=DEFAULT_WEIGHTS, classes=None, confidence_threshold=0.3, imgsz=None):
+        from ultralytics import YOLO
+
+        self.model = YOLO(weights)
+        self.names = self.model.names
+        self.confidence_threshold = confidence_threshold
+        self.imgsz = imgsz
+        self.class_ids = _class_ids(self.names, classes)
+
+    def predict(self, frame):
+        kwargs = {"verbose": False, "conf": self.confidence_threshold}
+        if self.imgsz:
+            kwargs["imgsz"] = self.imgsz
+        if self.class_ids is not None:
+            kwargs["classes"] = self.class_ids
+
+        results = self.model.predict(frame, **kwargs)[0]
+        found = []
+        for obj in results.boxes:
+            class_name = results.names[int(obj.cls[0])]
+            found.append((class_name, float(obj.conf[0]), tuple(map(int, obj.xyxy[0]))))
+        return found
+
+
+class OnnxBackend:
+    """
+    CPU inference through onnxruntime.
+
+    The .onnx file is exported next to the .pt weights on first use (needs
+    ultralytics + onnx once; afterwards only onnxruntime is required). The
+    model runs at a fixed, usually reduced, square input size and only the
+    score columns of the wanted classes are looked at before NMS.
+    """
+
+    def __init__(self, weights=DEFAULT_WEIGHTS, classes=None, confidence_threshold=0.3, imgsz=320,
+                 iou_threshold=0.45, threads=None):
+        import onnxruntime as ort
+
+        self.imgsz = imgsz
+        self.confidence_threshold = confidence_threshold
+        self.iou_threshold = iou_threshold
+
+        onnx_path = export_onnx(weights, imgsz)
+        options = ort.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(onnx_path, options, providers=["CPUExecutionProvider"])
+        self.input_name = self.session.get_inputs()[0].name
+
+        meta = self.session.get_modelmeta().custom_metadata_map
+        self.names = ast.literal_eval(meta["names"]) if "names" in meta else {}
+        ids = _class_ids(self.names, classes)
+        self.class_ids = np.array(ids if ids is not None else sorted(self.names), dtype=np.int64)
+
+    def _letterbox(self, frame):
+        h, w = frame.shape[:2]
+        scale = min(self.imgsz / h, self.imgsz / w)
+        nh, nw = int(round(h * scale)), int(round(w * scale))
+        top, left = (self.imgsz - nh) // 2, (self.imgsz - nw) // 2
+
+        canvas = np.full((self.imgsz, self.imgsz, 3), 114, dtype=np.uint8)
+        canvas[top:top + nh, left:left + nw] = cv2.resize(frame, (nw, nh), interpolation=cv2.INTER_LINEAR)
+        blob = cv2.dnn.blobFromImage(canvas, 1 / 255.0, swapRB=True)
+        return blob, scale, left, top
+
+    def predict(self, frame):
+        if len(self.class_ids) == 0:
+            return []
+
+        blob, scale, pad_x, pad_y = self._letterbox(frame)
+        # YOLOv8 output: (1, 4 + num_classes, num_anchors)
+        output = self.session.run(None, {self.input_name: blob})[0][0]
+
+        scores = output[4 + self.class_ids]
+        best = scores.argmax(axis=0)
+        conf = scores[best, np.arange(scores.shape[1])]
+        keep = conf >= self.confidence_threshold
+        if not keep.any():
+            return []
+
+        cx, cy, bw, bh = output[:4, keep]
+        conf = conf[keep]
+        cls = self.class_ids[best[keep]]
+
+        x1 = (cx - bw / 2 - pad_x) / scale
+        y1 = (cy - bh / 2 - pad_y) / scale
+        bw, bh = bw / scale, bh / scale
+        boxes = np.stack([x1, y1, bw, bh], axis=1)
+
+        h, w = frame.shape[:2]
+        indices = cv2.dnn.NMSBoxes(boxes.tolist(), conf.tolist(), self.confidence_threshold, self.iou_threshold)
+        found = []
+        for i in np.array(indices).flatten():
+            x, y, bw_i, bh_i = boxes[i]
+            box = (
+                int(max(0, x)), int(max(0, y)),
+                int(min(w - 1, x + bw_i)), int(min(h - 1, y + bh_i)),
+            )
+            found.append((self.names[int(cls[i])], float(conf[i]), box))
+        return found
+
+
+def export_onnx(weights=DEFAULT_WEIGHTS, imgsz=320):
+    """Return the path of `weights` exported to ONNX at `imgsz`, exporting it if needed."""
+    if weights.endswith(".onnx"):
+        return weights
+
+    onnx_path = f"{os.path.splitext(weights)[0]}_{imgsz}.onnx"
+    if not os.path.exists(onnx_path):
+        from ultralytics import YOLO
+
+        print(f"[INFO] Exporting {weights} to ONNX at {imgsz}px (one-time)...")
+        exported = YOLO(weights).export(format="onnx", imgsz=imgsz, dynamic=False, simplify=True)
+        os.replace(exported, onnx_path)
+    return onnx_path
+
+
+def _class_ids(names, classes):
+    if not classes:
+        return None
+    wanted = set(classes)
+    return [int(i) for i, name in names.items() if name in wanted]
+
+
+BACKENDS = {
+    "ultralytics": UltralyticsBackend,
+    "onnx": OnnxBackend,
+}
+
+
+def make_backend(name="ultralytics", **options):
+    try:
+        backend_cls = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown detection backend {name!r}; choose from {sorted(BACKENDS)}")
+    options = {k: v for k, v in options.items() if v is not None}
+    return backend_cls(**options)
@@ -0,0 +1,110 @@
+#  ---------------------------------------------------------------------------------------------------------
+#  |   DETECTOR REPLAY BENCHMARK - command ->  python -m face_for_interviewer.bench_replay <video|dir>      |
+#  ---------------------------------------------------------------------------------------------------------
+#  Replays a recording through InterviewCheatingDetector without a webcam and
+#  reports overall FPS, per-stage latency (face, hands, YOLO, encode) and the
+#  warnings the detector raised. Violation timers run on media time, so the
+#  warnings are the same at --realtime and at max speed.
+
+import argparse
+import json
+import threading
+import time
+
+from face_for_interviewer.main import InterviewCheatingDetector
+from face_for_interviewer.sources import open_source
+
+
+def replay(source, detector, max_frames=None):
+    stop_event = threading.Event()
+    frames = 0
+    canceled_at = None
+
+    start = time.perf_counter()
+    while source.isOpened() and (max_frames is None or frames < max_frames):
+        ret, frame = source.read()
+        if not ret:
+            break
+        detector.process_frame(frame, stop_event, now=source.timestamp)
+        frames += 1
+        if stop_event.is_set():
+            canceled_at = source.timestamp
+            break
+    elapsed = time.perf_counter() - start
+    source.release()
+    detector.close()
+
+    return {
+        "frames": frames,
+        "seconds": round(elapsed, 3),
+        "fps": round(frames / elapsed, 2) if elapsed else 0.0,
+        "media_seconds": round(source.timestamp, 3),
+        "stage_runs": detector.stage_runs,
+        "stage_latency_ms": {k: round(v, 2) for k, v in detector.stage_latency_ms().items()},
+        "pixels_per_run": {
+            name: detector.pixels_processed[name] // runs if runs else 0
+            for name, runs in detector.roi_runs.items()
+        },
+        "warnings": detector.warnings,
+        "evidence_clips": [
+            {"reason": c["reason"], "time": c["time"], "frames": len(c["frames"]), "truncated": c["truncated"]}
+            for c in detector.evidence_clips
+        ],
+        "evidence_bytes": detector.evidence.bytes_used() if detector.evidence else 0,
+        "canceled_at": canceled_at,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recording through the cheating detector")
+    parser.add_argument("source", help="video file or directory of images")
+    parser.add_argument("--realtime", action="store_true", help="pace playback to the native frame rate")
+    parser.add_argument("--fps", type=float, default=30.0, help="frame rate for image directories")
+    parser.add_argument("--max-frames", type=int)
+    parser.add_argument("--backend", default="ultralytics", choices=["ultralytics", "onnx"])
+    parser.add_argument("--yolo-imgsz", type=int)
+    parser.add_argument("--face-every", type=int, default=1)
+    parser.add_argument("--hands-every", type=int, default=3)
+    parser.add_argument("--yolo-every", type=int, default=10)
+    parser.add_argument("--no-motion-gate", action="store_true")
+    parser.add_argument("--roi", action="store_true", help="run hands/YOLO on the candidate region only")
+    parser.add_argument("--roi-full-every", type=int, default=15)
+    parser.add_argument("--max-suspicious-time", type=float, default=2.0)
+    parser.add_argument("--alert-cooldown", type=float, default=8.0)
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args()
+
+    detector = InterviewCheatingDetector(
+        max_suspicious_time=args.max_suspicious_time,
+        alert_cooldown=args.alert_cooldown,
+        face_every=args.face_every,
+        hands_every=args.hands_every,
+        yolo_every=args.yolo_every,
+        motion_gated=() if args.no_motion_gate else ("yolo",),
+        headless=True,
+        use_camera=False,
+        backend=args.backend,
+        yolo_imgsz=args.yolo_imgsz,
+        roi=args.roi,
+        roi_full_every=args.roi_full_every,
+    )
+    source = open_source(args.source, realtime=args.realtime, fps=args.fps)
+    report = replay(source, detector, args.max_frames)
+
+    print(f"\nFrames: {report['frames']} in {report['seconds']}s -> {report['fps']} fps")
+    print("Stage      runs   avg ms")
+    for name, runs in report["stage_runs"].items():
+        print(f"{name:<8} {runs:>6} {report['stage_latency_ms'][name]:>8.2f}")
+    print("Avg pixels per run:", report["pixels_per_run"])
+    print("Warnings:", report["warnings"] or "none")
+    print(f"Evidence clips: {len(report['evidence_clips'])} ({report['evidence_bytes'] / 1024:.0f} KiB held)")
+    if report["canceled_at"] is not None:
+        print(f"Interview would have been canceled at {report['canceled_at']:.1f}s")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
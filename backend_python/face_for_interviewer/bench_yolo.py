@@ -0,0 +1,96 @@
+#  ------------------------------------------------------------------------------------------
+#  |   YOLO BACKEND BENCHMARK - command ->  python -m face_for_interviewer.bench_yolo         |
+#  ------------------------------------------------------------------------------------------
+#  Compares frames/sec of the original ultralytics path (all 80 classes, default
+#  640px input) with the class-filtered ultralytics and ONNX Runtime backends on
+#  the CPU. Pass --source with a video or image for realistic frames; otherwise
+#  synthetic 640x480 frames are used (fine for throughput, not for accuracy).
+
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from face_for_interviewer.backends import DEFAULT_WEIGHTS, make_backend
+
+SUSPICIOUS_CLASSES = ["cell phone", "book", "handbag", "paper"]
+
+
+def load_frames(source, count):
+    if not source:
+        rng = np.random.default_rng(0)
+        return [rng.integers(0, 255, (480, 640, 3), dtype=np.uint8) for _ in range(min(count, 16))]
+
+    image = cv2.imread(source)
+    if image is not None:
+        return [image]
+
+    cap = cv2.VideoCapture(source)
+    frames = []
+    while len(frames) < count:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    if not frames:
+        raise SystemExit(f"Could not read frames from {source}")
+    return frames
+
+
+def bench(label, predict, frames, count, warmup=5):
+    for i in range(warmup):
+        predict(frames[i % len(frames)])
+
+    detections = 0
+    start = time.perf_counter()
+    for i in range(count):
+        detections += len(predict(frames[i % len(frames)]))
+    elapsed = time.perf_counter() - start
+
+    fps = count / elapsed
+    print(f"{label:<36} {fps:8.1f} fps {1000 / fps:8.1f} ms/frame {detections:6d} detections")
+    return fps
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark YOLO backends on CPU")
+    parser.add_argument("--source", help="video file or image to use as input frames")
+    parser.add_argument("--frames", type=int, default=100, help="frames to time per backend")
+    parser.add_argument("--weights", default=DEFAULT_WEIGHTS)
+    parser.add_argument("--imgsz", type=int, nargs="+", default=[320, 416], help="reduced input sizes to try")
+    parser.add_argument("--threads", type=int, help="onnxruntime intra-op threads")
+    parser.add_argument("--skip-onnx", action="store_true")
+    args = parser.parse_args()
+
+    frames = load_frames(args.source, args.frames)
+    print(f"Benchmarking on {len(frames)} distinct frame(s) of {frames[0].shape[1]}x{frames[0].shape[0]}\n")
+
+    from ultralytics import YOLO
+    baseline = YOLO(args.weights)
+    base_fps = bench(
+        "ultralytics (current path)",
+        lambda f: baseline.predict(f, verbose=False)[0].boxes,
+        frames,
+        args.frames,
+    )
+
+    results = {}
+    for imgsz in args.imgsz:
+        backend = make_backend("ultralytics", weights=args.weights, classes=SUSPICIOUS_CLASSES, imgsz=imgsz)
+        results[f"ultralytics filtered @{imgsz}"] = bench(
+            f"ultralytics filtered @{imgsz}", backend.predict, frames, args.frames
+        )
+        if not args.skip_onnx:
+            backend = make_backend("onnx", weights=args.weights, classes=SUSPICIOUS_CLASSES,
+                                   imgsz=imgsz, threads=args.threads)
+            results[f"onnx @{imgsz}"] = bench(f"onnx @{imgsz}", backend.predict, frames, args.frames)
+
+    print("\nSpeed-up over the current path:")
+    for label, fps in results.items():
+        print(f"  {label:<34} x{fps / base_fps:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+import queue
+import threading
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+# ------------------------------------------------------------------
+# EVIDENCE CLIP RECORDER
+# ------------------------------------------------------------------
+# Keeps a short ring of downscaled JPEG frames so every warning can be
+# attached to a pre/post-event clip. All JPEG encoding happens on the
+# recorder's own thread; the detection loop only downsamples and enqueues,
+# and never blocks: ring frames beyond a small backlog are dropped, events
+# are always queued.
+
+
+class EvidenceRecorder:
+    """
+    add_frame(frame, t)       - offer a frame (sampled at `fps`, downscaled by `scale`)
+    trigger(reason, t, frame) - start a clip: ring contents + `post_seconds` more frames;
+                                `frame` is encoded full size and passed to
+                                on_evidence(jpeg, encode_seconds)
+    clips                     - finished (and in-progress) clips, oldest first
+    close()                   - flush the encoder and finish open clips
+
+    Memory is capped at `max_bytes` for the ring plus all clips, stills
+    included; when the cap is hit the frames of the oldest clips are dropped
+    first, then their stills (the reason is always kept), and the clip is
+    marked truncated.
+    """
+
+    def __init__(self, pre_seconds=3.0, post_seconds=2.0, fps=5.0, scale=0.5, quality=70,
+                 max_bytes=16 * 1024 * 1024, on_evidence=None):
+        self.pre_seconds = pre_seconds
+        self.post_seconds = post_seconds
+        self.interval = 1.0 / fps
+        self.fps = fps
+        self.scale = scale
+        self.quality = quality
+        self.max_bytes = max_bytes
+        self.on_evidence = on_evidence
+
+        self.clips = []
+        self.dropped_frames = 0
+        self.lock = threading.Lock()
+        self._ring = deque()
+        self._ring_bytes = 0
+        self._clip_bytes = 0
+        self._open = []
+        self._last_sample = None
+        # one ordered queue so events see exactly the ring frames offered before
+        # them; only frames count against the backlog, events are never refused
+        self._queue = queue.Queue()
+        self._frame_slots = threading.BoundedSemaphore(16)
+        self._thread = threading.Thread(target=self._encode_loop, daemon=True)
+        self._thread.start()
+
+    # ---------------- detection-thread side ----------------
+
+    def add_frame(self, frame, t):
+        if self._last_sample is not None and t - self._last_sample < self.interval:
+            return
+        self._last_sample = t
+        if not self._frame_slots.acquire(blocking=False):
+            self.dropped_frames += 1
+            return
+        small = cv2.resize(frame, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA)
+        self._queue.put(("frame", t, small))
+
+    def trigger(self, reason, t, frame):
+        # evidence is never dropped; copy because the caller may keep drawing on it
+        self._queue.put(("event", t, (reason, np.array(frame, copy=True))))
+
+    def close(self, timeout=5.0):
+        self._queue.put(None)
+        self._thread.join(timeout)
+        with self.lock:
+            self._open = []
+
+    # ---------------- encoder thread ----------------
+
+    def _encode(self, image, quality):
+        ok, jpeg = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, quality])
+        return jpeg.tobytes() if ok else None
+
+    def _encode_loop(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            kind, t, payload = item
+
+            if kind == "frame":
+                self._frame_slots.release()
+                jpeg = self._encode(payload, self.quality)
+                if jpeg:
+                    self._add_encoded(t, jpeg)
+            else:
+                reason, frame = payload
+                start = time.perf_counter()
+                still = self._encode(frame, 90)
+                if self.on_evidence and still:
+                    self.on_evidence(still, time.perf_counter() - start)
+                self._start_clip(reason, t, still)
+
+    def _add_encoded(self, t, jpeg):
+        with self.lock:
+            self._ring.append((t, jpeg))
+            self._ring_bytes += len(jpeg)
+            while self._ring and self._ring[0][0] < t - self.pre_seconds:
+                self._ring_bytes -= len(self._ring.popleft()[1])
+
+            for clip in list(self._open):
+                clip["frames"].append((t, jpeg))
+                self._clip_bytes += len(jpeg)
+                if t >= clip["end"]:
+                    self._open.remove(clip)
+            self._enforce_cap()
+
+    def _start_clip(self, reason, t, still):
+        with self.lock:
+            frames = list(self._ring)
+            clip = {
+                "reason": reason,
+                "time": t,
+                "end": t + self.post_seconds,
+                "still": still,
+                "frames": frames,
+                "truncated": False,
+            }
+            self.clips.append(clip)
+            self._clip_bytes += sum(len(jpeg) for _, jpeg in frames) + len(still or b"")
+            if self.post_seconds > 0:
+                self._open.append(clip)
+            self._enforce_cap()
+
+    def _over_cap(self):
+        return self._ring_bytes + self._clip_bytes > self.max_bytes
+
+    def _enforce_cap(self):
+        for clip in self.clips:
+            if not self._over_cap():
+                return
+            if clip["frames"]:
+                self._clip_bytes -= sum(len(jpeg) for _, jpeg in clip["frames"])
+                clip["frames"] = []
+                clip["truncated"] = True
+                if clip in self._open:
+                    self._open.remove(clip)
+
+        # still over: the full-size stills go too, oldest first
+        for clip in self.clips:
+            if not self._over_cap():
+                return
+            if clip["still"]:
+                self._clip_bytes -= len(clip["still"])
+                clip["still"] = None
+                clip["truncated"] = True
+
+    def bytes_used(self):
+        with self.lock:
+            return self._ring_bytes + self._clip_bytes
+
+
+def write_clip(clip, path, fps=5.0):
+    """Decode a clip's JPEG frames into an MJPG .avi at `path`. Returns False if the clip is empty."""
+    frames = [cv2.imdecode(np.frombuffer(jpeg, np.uint8), cv2.IMREAD_COLOR) for _, jpeg in clip["frames"]]
+    frames = [f for f in frames if f is not None]
+    if not frames:
+        return False
+
+    h, w = frames[0].shape[:2]
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), fps, (w, h))
+    for frame in frames:
+        writer.write(frame)
+    writer.release()
+    return True
@@ -1,52 +1,485 @@
 import cv2
 import mediapipe as mp
+import numpy as np
+import threading
 import time
-from ultralytics import YOLO
+from concurrent.futures import Future, ThreadPoolExecutor
+from face_for_interviewer.backends import DEFAULT_WEIGHTS, make_backend
+from face_for_interviewer.evidence import EvidenceRecorder
+from face_for_interviewer.sources import LatestFrameCapture, configure_capture
+
+# size of the grayscale thumbnail used for the frame-difference score
+MOTION_THUMB_SIZE = (64, 48)
+
+SUSPICIOUS_CLASSES = ["cell phone", "book", "handbag", "paper"]
+
+# camera warm-up and model loading run here, side by side
+_STARTUP_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="vision-startup")
+
+# detector keyword arguments that describe the capture device
+CAPTURE_OPTIONS = ("capture_width", "capture_height", "capture_fps", "capture_fourcc", "threaded_capture")
+
+
+def open_camera(camera_index=0, warmup=0.0, capture_width=640, capture_height=480, capture_fps=None,
+                capture_fourcc="MJPG", threaded_capture=True):
+    """
+    Open the requested camera, falling back to the first working index, and
+    request the given resolution / frame rate / codec from the driver.
+    With warmup > 0, frames are read (for at most that many seconds) until the
+    sensor delivers a non-black image. With threaded_capture the returned
+    object keeps only the newest frame (LatestFrameCapture). Returns (cap, index).
+    """
+    print(f"[INFO] Opening camera index {camera_index}...")
+    cap = cv2.VideoCapture(camera_index, cv2.CAP_DSHOW)
+
+    # Retry logic
+    if not cap.isOpened():
+        print(f"⚠️ Camera index {camera_index} failed. Retrying with other indexes...")
+        for i in range(3):
+            temp_cap = cv2.VideoCapture(i, cv2.CAP_DSHOW)
+            if temp_cap.isOpened():
+                print(f"✅ Camera successfully opened at index {i}.")
+                cap, camera_index = temp_cap, i
+                break
+        else:
+            raise RuntimeError("❌ Could not open any available camera!")
+
+    configure_capture(cap, capture_width, capture_height, capture_fps, capture_fourcc)
+
+    deadline = time.time() + warmup
+    while time.time() < deadline:
+        ret, frame = cap.read()
+        if ret and frame.mean() > 1.0:
+            break
+
+    if threaded_capture:
+        cap = LatestFrameCapture(cap)
+    return cap, camera_index
+
+
+# ------------------------------------------------------------------
+# SHARED MODELS
+# ------------------------------------------------------------------
+class VisionModels:
+    """
+    MediaPipe face graph and the object detector, loaded once per process
+    and shared by every detector. They are not thread-safe, so each one has
+    its own lock for sessions running side by side. The hands graph tracks
+    landmarks from frame to frame, so each detector builds its own instead
+    (see make_hands).
+    """
+
+    def __init__(self, backend="ultralytics", weights=DEFAULT_WEIGHTS, imgsz=None,
+                 classes=tuple(SUSPICIOUS_CLASSES), confidence_threshold=0.3):
+        self.face_detection = mp.solutions.face_detection.FaceDetection(
+            model_selection=0, min_detection_confidence=0.5)
+        # backend: "ultralytics" (PyTorch) or "onnx" (onnxruntime on CPU);
+        # imgsz lowers the network input size (onnx defaults to 320)
+        print(f"[INFO] Loading YOLO model via {backend} (first time may take a few seconds)...")
+        self.object_detector = make_backend(
+            backend,
+            weights=weights,
+            classes=list(classes),
+            confidence_threshold=confidence_threshold,
+            imgsz=imgsz,
+        )
+
+        self.face_lock = threading.Lock()
+        self.object_lock = threading.Lock()
+
+
+def make_hands(static_image_mode=False):
+    """
+    A MediaPipe Hands graph for one detector. With static_image_mode=False it
+    carries landmarks over between calls, so it must only ever see one
+    camera's consecutive full frames; ROI crops use a static instance.
+    """
+    return mp.solutions.hands.Hands(
+        static_image_mode=static_image_mode,
+        max_num_hands=2,
+        min_detection_confidence=0.5,
+        min_tracking_confidence=0.5,
+    )
+
+
+_MODELS = {}
+_MODELS_LOCK = threading.Lock()
+
+
+def get_vision_models(backend="ultralytics", weights=DEFAULT_WEIGHTS, imgsz=None,
+                      classes=tuple(SUSPICIOUS_CLASSES), confidence_threshold=0.3):
+    """Return the process-wide VisionModels for this configuration, loading it on first use."""
+    key = (backend, weights, imgsz, tuple(classes), confidence_threshold)
+    with _MODELS_LOCK:
+        future = _MODELS.get(key)
+        owner = future is None
+        if owner:
+            future = Future()
+            _MODELS[key] = future
+
+    if owner:
+        try:
+            future.set_result(VisionModels(backend, weights, imgsz, classes, confidence_threshold))
+        except Exception as e:
+            with _MODELS_LOCK:
+                del _MODELS[key]
+            future.set_exception(e)
+
+    return future.result()
+
+
+def preload_vision_models(**options):
+    """Start loading the shared vision models in the background; returns a Future."""
+    return _STARTUP_POOL.submit(get_vision_models, **options)
+
 
 class InterviewCheatingDetector:
-    def __init__(self, max_suspicious_time=2.0, camera_index=0, confidence_threshold=0.3, alert_cooldown=5.0):
+    def __init__(self, max_suspicious_time=2.0, camera_index=0, confidence_threshold=0.3, alert_cooldown=5.0,
+                 face_every=1, hands_every=3, yolo_every=10, motion_gated=("yolo",), motion_threshold=6.0,
+                 headless=False, use_camera=True, backend="ultralytics", yolo_weights=DEFAULT_WEIGHTS,
+                 yolo_imgsz=None, async_start=False, source=None, capture_width=640, capture_height=480,
+                 capture_fps=None, capture_fourcc="MJPG", threaded_capture=True,
+                 roi=False, roi_full_every=15, roi_width_factor=3.0, roi_top_factor=0.5,
+                 evidence_clips=True, clip_pre_seconds=3.0, clip_post_seconds=2.0, clip_fps=5.0,
+                 clip_scale=0.5, evidence_max_bytes=16 * 1024 * 1024):
         self.max_suspicious_time = max_suspicious_time
         self.confidence_threshold = confidence_threshold
         self.alert_cooldown = alert_cooldown
         self.suspicious_start_time = None
-        self.last_alert_time = 0
+        self.last_alert_time = None
         self.alert_count = 0
         self.warnings = []
         self.latest_frame_bytes = None
         self.camera_index = camera_index
 
-        # Initialize MediaPipe
-        self.mp_face = mp.solutions.face_detection
-        self.mp_draw = mp.solutions.drawing_utils
-        self.face_detection = self.mp_face.FaceDetection(model_selection=0, min_detection_confidence=0.5)
+        # Headless: no per-frame drawing and no OpenCV window; only the frame
+        # captured as latest_frame_bytes evidence gets annotated.
+        self.headless = headless
+
+        # Detector schedules: each detector runs at least every N frames and
+        # reuses its last result in between. Detectors listed in motion_gated
+        # also run early when the scene changed by more than motion_threshold
+        # (mean absolute gray-level difference since that detector last ran).
+        self.schedule = {"face": face_every, "hands": hands_every, "yolo": yolo_every}
+        self.motion_gated = set(motion_gated or ())
+        self.motion_threshold = motion_threshold
+        self.frame_index = 0
+        self.stage_runs = {name: 0 for name in self.schedule}
+        self.stage_runs["encode"] = 0
+        self.stage_time = {name: 0.0 for name in self.stage_runs}
+        self._last_run = {name: None for name in self.schedule}
+        self._motion_ref = {}
+
+        # ROI mode: hands and YOLO only look at the candidate/desk region
+        # derived from the face box (roi_width_factor face widths either side
+        # of the face centre, from roi_top_factor face heights above it down
+        # to the bottom of the frame). Every roi_full_every-th run of each of
+        # them, or whenever no face is known, sweeps the full frame instead.
+        self.roi = roi
+        self.roi_full_every = max(1, roi_full_every)
+        self.roi_width_factor = roi_width_factor
+        self.roi_top_factor = roi_top_factor
+        self.roi_runs = {"hands": 0, "yolo": 0}
+        self.pixels_processed = {"hands": 0, "yolo": 0}
+
+        # Evidence clips: a bounded ring of small JPEGs gives every warning a
+        # pre/post-event clip, and the evidence still is encoded on the
+        # recorder's thread instead of inside the detection loop.
+        self.evidence = None
+        if evidence_clips:
+            self.evidence = EvidenceRecorder(
+                pre_seconds=clip_pre_seconds,
+                post_seconds=clip_post_seconds,
+                fps=clip_fps,
+                scale=clip_scale,
+                max_bytes=evidence_max_bytes,
+                on_evidence=self._set_evidence,
+            )
 
+        # Last detector results (reused on frames where a detector is skipped)
+        self.face_boxes = []
+        self.hand_landmarks = []
+        self.suspicious_objects = []
+
+        self.mp_draw = mp.solutions.drawing_utils
         self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(max_num_hands=2, min_detection_confidence=0.5, min_tracking_confidence=0.5)
-
-        # Initialize YOLO after confirming camera
-        print(f"[INFO] Opening camera index {camera_index}...")
-        self.cap = cv2.VideoCapture(camera_index, cv2.CAP_DSHOW)
-
-        # Retry logic
-        if not self.cap.isOpened():
-            print(f"⚠️ Camera index {camera_index} failed. Retrying with other indexes...")
-            for i in range(3):
-                temp_cap = cv2.VideoCapture(i, cv2.CAP_DSHOW)
-                if temp_cap.isOpened():
-                    print(f"✅ Camera successfully opened at index {i}.")
-                    self.cap = temp_cap
-                    self.camera_index = i
-                    break
-            else:
-                raise RuntimeError("❌ Could not open any available camera!")
-
-        time.sleep(2)  # Let camera warm up before YOLO load
-
-        print("[INFO] Loading YOLO model (first time may take a few seconds)...")
-        self.model = YOLO("yolov8n.pt")
-        self.suspicious_classes = ["cell phone", "book", "handbag", "paper"]
+        self.suspicious_classes = list(SUSPICIOUS_CLASSES)
+
+        # Camera warm-up and (shared) model loading run concurrently. With
+        # async_start the constructor returns at once and `ready` resolves
+        # when both are done; run() waits for it. `source` replaces the
+        # camera with any object that has read()/isOpened()/release() (see
+        # face_for_interviewer.sources); use_camera=False is for callers that
+        # feed frames to process_frame() themselves.
+        self.cap = None
+        self.models = None
+        self.model = None
+        self.hands = None
+        self.roi_hands = None
+        self.ready = Future()
+        model_options = dict(
+            backend=backend,
+            weights=yolo_weights,
+            imgsz=yolo_imgsz,
+            classes=tuple(self.suspicious_classes),
+            confidence_threshold=confidence_threshold,
+        )
+        capture_options = dict(
+            capture_width=capture_width,
+            capture_height=capture_height,
+            capture_fps=capture_fps,
+            capture_fourcc=capture_fourcc,
+            threaded_capture=threaded_capture,
+        )
+        startup_args = (use_camera and source is None, camera_index, capture_options, model_options)
+        if source is not None:
+            self.cap = source
+        if async_start:
+            threading.Thread(target=self._startup, args=startup_args, daemon=True).start()
+        else:
+            self._startup(*startup_args)
+            self.ready.result()
+
+    def _startup(self, use_camera, camera_index, capture_options, model_options):
+        try:
+            camera = None
+            if use_camera:
+                camera = _STARTUP_POOL.submit(open_camera, camera_index, 2.0, **capture_options)
+            models = _STARTUP_POOL.submit(get_vision_models, **model_options)
+            self.hands = make_hands()
+            if self.roi:
+                # crops move with the face and alternate with full-frame sweeps,
+                # so landmarks tracked on the previous image would not line up
+                self.roi_hands = make_hands(static_image_mode=True)
+            if camera is not None:
+                self.cap, self.camera_index = camera.result()
+            self.models = models.result()
+            self.model = self.models.object_detector
+            self.ready.set_result(self)
+        except Exception as e:
+            if self.cap is not None:
+                self.cap.release()
+            self.ready.set_exception(e)
+
+    # ---------------- scheduling ----------------
+
+    def _motion_thumb(self, frame):
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        return cv2.resize(gray, MOTION_THUMB_SIZE, interpolation=cv2.INTER_AREA).astype(np.int16)
+
+    def _due(self, name, thumb):
+        last = self._last_run[name]
+        if last is None or self.frame_index - last >= self.schedule[name]:
+            return True
+        if name in self.motion_gated and thumb is not None:
+            ref = self._motion_ref.get(name)
+            return ref is not None and float(np.mean(np.abs(thumb - ref))) >= self.motion_threshold
+        return False
+
+    def _mark_run(self, name, thumb):
+        self._last_run[name] = self.frame_index
+        if name in self.motion_gated:
+            self._motion_ref[name] = thumb
+
+    def _timed(self, name, fn, *args):
+        start = time.perf_counter()
+        result = fn(*args)
+        self.stage_time[name] += time.perf_counter() - start
+        self.stage_runs[name] += 1
+        return result
+
+    def stage_latency_ms(self):
+        """Average milliseconds per run of each stage so far."""
+        return {
+            name: 1000.0 * self.stage_time[name] / runs if runs else 0.0
+            for name, runs in self.stage_runs.items()
+        }
+
+    # ---------------- detectors ----------------
+
+    def _detect_faces(self, rgb_frame):
+        with self.models.face_lock:
+            face_results = self.models.face_detection.process(rgb_frame)
+        boxes = []
+        if face_results.detections:
+            h, w, _ = rgb_frame.shape
+            for detection in face_results.detections:
+                bboxC = detection.location_data.relative_bounding_box
+                boxes.append((int(bboxC.xmin * w), int(bboxC.ymin * h), int(bboxC.width * w), int(bboxC.height * h)))
+        return boxes
+
+    def _detect_hands(self, rgb_frame):
+        region = self._region("hands", rgb_frame.shape)
+        if region is None:
+            hand_results = self.hands.process(rgb_frame)
+            return list(hand_results.multi_hand_landmarks or [])
+
+        x0, y0, x1, y1 = region
+        crop = np.ascontiguousarray(rgb_frame[y0:y1, x0:x1])
+        hand_results = self.roi_hands.process(crop)
+
+        # landmarks come back normalized to the crop; map them to the frame
+        h, w = rgb_frame.shape[:2]
+        mapped = []
+        for hand_landmarks in hand_results.multi_hand_landmarks or []:
+            full = type(hand_landmarks)()
+            full.CopyFrom(hand_landmarks)
+            for lm in full.landmark:
+                lm.x = (x0 + lm.x * (x1 - x0)) / w
+                lm.y = (y0 + lm.y * (y1 - y0)) / h
+            mapped.append(full)
+        return mapped
+
+    def _detect_objects(self, frame):
+        region = self._region("yolo", frame.shape)
+        if region is None:
+            x0 = y0 = 0
+            found = self._predict_objects(frame)
+        else:
+            x0, y0, x1, y1 = region
+            found = self._predict_objects(np.ascontiguousarray(frame[y0:y1, x0:x1]))
+
+        return [
+            (class_name, conf, (bx1 + x0, by1 + y0, bx2 + x0, by2 + y0))
+            for class_name, conf, (bx1, by1, bx2, by2) in found
+            if class_name in self.suspicious_classes and conf >= self.confidence_threshold
+        ]
+
+    def _region(self, name, shape):
+        """Crop (x0, y0, x1, y1) for this run of `name`, or None for a full-frame sweep."""
+        h, w = shape[:2]
+        run = self.roi_runs[name]
+        self.roi_runs[name] += 1
+
+        if not self.roi or not self.face_boxes or run % self.roi_full_every == 0:
+            self.pixels_processed[name] += h * w
+            return None
+
+        x, y, w_box, h_box = max(self.face_boxes, key=lambda b: b[2] * b[3])
+        cx = x + w_box / 2
+        x0 = int(max(0, cx - self.roi_width_factor * w_box))
+        x1 = int(min(w, cx + self.roi_width_factor * w_box))
+        y0 = int(max(0, y - self.roi_top_factor * h_box))
+        y1 = h
+        if x1 - x0 < 32 or y1 - y0 < 32:
+            self.pixels_processed[name] += h * w
+            return None
+
+        self.pixels_processed[name] += (x1 - x0) * (y1 - y0)
+        return x0, y0, x1, y1
+
+    def _predict_objects(self, frame):
+        with self.models.object_lock:
+            return self.model.predict(frame)
+
+    def _annotate(self, frame):
+        for x, y, w_box, h_box in self.face_boxes:
+            cv2.rectangle(frame, (x, y), (x + w_box, y + h_box), (0, 255, 0), 2)
+            cv2.putText(frame, "Face", (x, y - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
+
+        for hand_landmarks in self.hand_landmarks:
+            self.mp_draw.draw_landmarks(frame, hand_landmarks, self.mp_hands.HAND_CONNECTIONS)
+
+        for class_name, conf, (x1, y1, x2, y2) in self.suspicious_objects:
+            cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 0, 255), 2)
+            cv2.putText(frame, f"{class_name} ({conf:.2f})", (x1, y1 - 10),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 255), 2)
+
+    # ---------------- evidence ----------------
+
+    def _set_evidence(self, jpeg_bytes, encode_seconds):
+        # called on the recorder's thread, so the "encode" stage is the real JPEG encode
+        self.latest_frame_bytes = jpeg_bytes
+        self.stage_time["encode"] += encode_seconds
+        self.stage_runs["encode"] += 1
+
+    @property
+    def evidence_clips(self):
+        return self.evidence.clips if self.evidence else []
+
+    def close(self):
+        """Flush pending evidence encoding (latest_frame_bytes / clips are final afterwards)."""
+        if self.evidence:
+            self.evidence.close()
+        for hands in (self.hands, self.roi_hands):
+            if hands is not None:
+                hands.close()
+
+    # ---------------- main loop ----------------
+
+    def process_frame(self, frame, stop_event, now=None):
+        """
+        Run the scheduled detectors on one BGR frame and update the violation
+        state. `now` overrides the wall clock (replays pass the frame timestamp
+        so timing rules behave the same at any playback speed).
+        """
+        self.frame_index += 1
+        thumb = self._motion_thumb(frame) if self.motion_gated else None
+        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+        # FACE DETECTION
+        if self._due("face", thumb):
+            self.face_boxes = self._timed("face", self._detect_faces, rgb_frame)
+            self._mark_run("face", thumb)
+
+        # HAND DETECTION
+        if self._due("hands", thumb):
+            self.hand_landmarks = self._timed("hands", self._detect_hands, rgb_frame)
+            self._mark_run("hands", thumb)
+
+        # YOLO DETECTION
+        if self._due("yolo", thumb):
+            self.suspicious_objects = self._timed("yolo", self._detect_objects, frame)
+            self._mark_run("yolo", thumb)
+
+        face_detected = bool(self.face_boxes)
+        hands_missing = len(self.hand_landmarks) < 2
+        suspicious_detected = bool(self.suspicious_objects)
+        current_time = time.time() if now is None else now
+
+        if self.evidence:
+            self.evidence.add_frame(frame, current_time)
+
+        if not self.headless:
+            self._annotate(frame)
+
+        # VIOLATION LOGIC
+        violation = not face_detected or suspicious_detected or hands_missing
+
+        if violation:
+            if self.suspicious_start_time is None:
+                self.suspicious_start_time = current_time
+            elif current_time - self.suspicious_start_time >= self.max_suspicious_time:
+                if self.last_alert_time is None or current_time - self.last_alert_time >= self.alert_cooldown:
+                    self.alert_count += 1
+                    self.last_alert_time = current_time
+                    self.suspicious_start_time = None
+                    reason = ("Face not detected" if not face_detected else
+                              "Both hands not detected" if hands_missing else
+                              "Suspicious object detected")
+                    print(f"[Warning] {reason}")
+                    self.warnings.append(reason)
+                    if self.headless:
+                        self._annotate(frame)
+                    if self.evidence:
+                        self.evidence.trigger(reason, current_time, frame)
+                    else:
+                        _, jpeg = self._timed("encode", cv2.imencode, '.jpg', frame)
+                        self.latest_frame_bytes = jpeg.tobytes()
+
+                    if self.alert_count >= 3:
+                        self.warnings.append("Interview canceled due to repeated suspicious activities.")
+                        stop_event.set()
+        else:
+            self.suspicious_start_time = None
 
     def run(self, stop_event):
+        try:
+            self.ready.result()
+        except Exception as e:
+            print("❌ Vision module failed to start:", e)
+            return self.warnings
+
         print(f"[INFO] Cheating detector running on camera index {self.camera_index}...")
 
         while not stop_event.is_set() and self.cap.isOpened():
@@ -56,68 +489,10 @@ class InterviewCheatingDetector:
                 time.sleep(0.2)
                 continue
 
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-
-            # FACE DETECTION
-            face_results = self.face_detection.process(rgb_frame)
-            face_detected = bool(face_results.detections)
-
-            if face_detected:
-                for detection in face_results.detections:
-                    bboxC = detection.location_data.relative_bounding_box
-                    h, w, _ = frame.shape
-                    x, y, w_box, h_box = int(bboxC.xmin * w), int(bboxC.ymin * h), int(bboxC.width * w), int(bboxC.height * h)
-                    cv2.rectangle(frame, (x, y), (x + w_box, y + h_box), (0, 255, 0), 2)
-                    cv2.putText(frame, "Face", (x, y - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
+            self.process_frame(frame, stop_event)
 
-            # HAND DETECTION
-            hand_results = self.hands.process(rgb_frame)
-            num_hands_detected = 0
-            if hand_results.multi_hand_landmarks:
-                for hand_landmarks in hand_results.multi_hand_landmarks:
-                    num_hands_detected += 1
-                    self.mp_draw.draw_landmarks(frame, hand_landmarks, self.mp_hands.HAND_CONNECTIONS)
-
-            hands_missing = num_hands_detected < 2
-
-            # YOLO DETECTION
-            results = self.model.predict(frame, verbose=False)[0]
-            suspicious_detected = False
-            for obj in results.boxes:
-                class_name = results.names[int(obj.cls[0])]
-                conf = float(obj.conf[0])
-                if class_name in self.suspicious_classes and conf >= self.confidence_threshold:
-                    suspicious_detected = True
-                    x1, y1, x2, y2 = map(int, obj.xyxy[0])
-                    cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 0, 255), 2)
-                    cv2.putText(frame, f"{class_name} ({conf:.2f})", (x1, y1 - 10),
-                                cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 255), 2)
-
-            # VIOLATION LOGIC
-            violation = not face_detected or suspicious_detected or hands_missing
-            current_time = time.time()
-
-            if violation:
-                if self.suspicious_start_time is None:
-                    self.suspicious_start_time = current_time
-                elif current_time - self.suspicious_start_time >= self.max_suspicious_time:
-                    if current_time - self.last_alert_time >= self.alert_cooldown:
-                        self.alert_count += 1
-                        self.last_alert_time = current_time
-                        self.suspicious_start_time = None
-                        reason = ("Face not detected" if not face_detected else
-                                  "Both hands not detected" if hands_missing else
-                                  "Suspicious object detected")
-                        print(f"[Warning] {reason}")
-                        self.warnings.append(reason)
-                        _, jpeg = cv2.imencode('.jpg', frame)
-                        self.latest_frame_bytes = jpeg.tobytes()
-
-                        if self.alert_count >= 3:
-                            self.warnings.append("Interview canceled due to repeated suspicious activities.")
-                            stop_event.set()
-            else:
-                self.suspicious_start_time = None
+            if self.headless:
+                continue
 
             cv2.imshow("Interview Cheating Detector", frame)
             if cv2.waitKey(1) & 0xFF == ord('q'):
@@ -125,16 +500,40 @@ class InterviewCheatingDetector:
                 break
 
         self.cap.release()
-        cv2.destroyAllWindows()
+        self.close()
+        if not self.headless:
+            cv2.destroyAllWindows()
         print("[INFO] Camera released and window closed.")
+        print(f"[INFO] Detector runs over {self.frame_index} frames: {self.stage_runs}")
+        print(f"[INFO] Avg stage latency (ms): {self.stage_latency_ms()}")
         return self.warnings
 
 
 
-def run_vision_module(stop_event, max_suspicious_time=2.0, camera_index=0, alert_cooldown=8.0):
+def run_vision_module(stop_event, max_suspicious_time=2.0, camera_index=0, alert_cooldown=8.0, headless=False,
+                      out_of_process=False, async_start=True, **detector_options):
+    """
+    Build the cheating detector without blocking the interview: camera and
+    models come up in the background and `detector.ready` is a Future that
+    resolves once they have (detector.run() waits for it).
+    """
+    if out_of_process:
+        # detector runs in its own interpreter; frames go through shared memory
+        from face_for_interviewer.worker import VisionProcess
+        return VisionProcess(
+            camera_index=camera_index,
+            max_suspicious_time=max_suspicious_time,
+            alert_cooldown=alert_cooldown,
+            async_start=async_start,
+            **detector_options
+        )
+
     detector = InterviewCheatingDetector(
         max_suspicious_time=max_suspicious_time,
         camera_index=camera_index,
-        alert_cooldown=alert_cooldown
+        alert_cooldown=alert_cooldown,
+        headless=headless,
+        async_start=async_start,
+        **detector_options
     )
-    return detector
\ No newline at end of file
+    return detector
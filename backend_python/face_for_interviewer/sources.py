@@ -0,0 +1,199 @@
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+
+import cv2
+
+# ------------------------------------------------------------------
+# FRAME SOURCES
+# ------------------------------------------------------------------
+# Offline stand-ins for cv2.VideoCapture (plus the threaded live-camera
+# wrapper and capture-format helper at the bottom). They expose the same
+# read() / isOpened() / release() calls the detector uses, plus
+# `timestamp` (seconds into the recording of the last frame read) so replays
+# can drive the violation timers from media time instead of the wall clock.
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp", ".webp")
+
+
+class FrameSource(ABC):
+    def __init__(self, fps, realtime=False, loop=False):
+        self.fps = fps or 30.0
+        self.realtime = realtime
+        self.loop = loop
+        self.timestamp = 0.0
+        self.frames_read = 0
+        self._opened = True
+        self._started_at = None
+
+    @abstractmethod
+    def _next_frame(self):
+        """The next frame, or None at the end of the recording."""
+
+    @abstractmethod
+    def _rewind(self):
+        """Go back to the first frame (used with loop=True)."""
+
+    def read(self):
+        if not self._opened:
+            return False, None
+
+        frame = self._next_frame()
+        if frame is None and self.loop and self.frames_read:
+            self._rewind()
+            frame = self._next_frame()
+        if frame is None:
+            self._opened = False
+            return False, None
+
+        self.timestamp = self.frames_read / self.fps
+        self.frames_read += 1
+
+        if self.realtime:
+            # pace to the recording's native rate
+            if self._started_at is None:
+                self._started_at = time.perf_counter()
+            delay = self._started_at + self.timestamp - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        return True, frame
+
+    def isOpened(self):
+        return self._opened
+
+    def release(self):
+        self._opened = False
+
+
+class VideoFileSource(FrameSource):
+    def __init__(self, path, realtime=False, loop=False):
+        self.cap = cv2.VideoCapture(path)
+        if not self.cap.isOpened():
+            raise RuntimeError(f"❌ Could not open video file {path}")
+        super().__init__(self.cap.get(cv2.CAP_PROP_FPS), realtime, loop)
+
+    def _next_frame(self):
+        ret, frame = self.cap.read()
+        return frame if ret else None
+
+    def _rewind(self):
+        self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+
+    def release(self):
+        super().release()
+        self.cap.release()
+
+
+class ImageDirectorySource(FrameSource):
+    """Plays the images of a directory in file-name order at `fps`."""
+
+    def __init__(self, path, fps=30.0, realtime=False, loop=False):
+        self.paths = sorted(
+            os.path.join(path, name)
+            for name in os.listdir(path)
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        if not self.paths:
+            raise RuntimeError(f"❌ No images found in {path}")
+        self._index = 0
+        super().__init__(fps, realtime, loop)
+
+    def _next_frame(self):
+        while self._index < len(self.paths):
+            frame = cv2.imread(self.paths[self._index])
+            self._index += 1
+            if frame is not None:
+                return frame
+        return None
+
+    def _rewind(self):
+        self._index = 0
+
+
+def open_source(spec, realtime=False, fps=30.0, loop=False):
+    """Open a directory of images or a video file as a frame source."""
+    if os.path.isdir(spec):
+        return ImageDirectorySource(spec, fps=fps, realtime=realtime, loop=loop)
+    return VideoFileSource(spec, realtime=realtime, loop=loop)
+
+
+class LatestFrameCapture:
+    """
+    Wraps a live cv2.VideoCapture with a grab thread that keeps only the
+    newest frame. read() returns the most recent frame not yet handed out
+    (waiting up to `timeout` for one), so a slow consumer skips stale frames
+    instead of draining the driver's buffer seconds behind reality.
+    """
+
+    def __init__(self, cap, timeout=1.0):
+        self.cap = cap
+        self.timeout = timeout
+        self.frames_grabbed = 0
+        self.frames_dropped = 0
+        self._cond = threading.Condition()
+        self._frame = None
+        self._seq = 0
+        self._read_seq = 0
+        self._running = True
+        self._thread = threading.Thread(target=self._grab_loop, daemon=True)
+        self._thread.start()
+
+    def _grab_loop(self):
+        while self._running:
+            ret, frame = self.cap.read()
+            if not ret:
+                time.sleep(0.01)
+                continue
+            with self._cond:
+                if self._seq > self._read_seq:
+                    self.frames_dropped += 1
+                self._frame = frame
+                self._seq += 1
+                self.frames_grabbed += 1
+                self._cond.notify_all()
+
+    def read(self):
+        with self._cond:
+            fresh = self._cond.wait_for(
+                lambda: self._seq > self._read_seq or not self._running, self.timeout
+            )
+            if not fresh or not self._running:
+                return False, None
+            self._read_seq = self._seq
+            return True, self._frame
+
+    def isOpened(self):
+        return self._running and self.cap.isOpened()
+
+    def get(self, prop):
+        return self.cap.get(prop)
+
+    def release(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        self._thread.join(timeout=2.0)
+        self.cap.release()
+
+
+def configure_capture(cap, width=None, height=None, fps=None, fourcc=None):
+    """
+    Request a capture format from the driver. The codec is set first because
+    many webcams only offer higher resolutions / frame rates as MJPG. A
+    one-frame driver buffer keeps latency low even without a grab thread.
+    """
+    if fourcc:
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+    if width:
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+    if height:
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+    if fps:
+        cap.set(cv2.CAP_PROP_FPS, fps)
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+    actual = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+              cap.get(cv2.CAP_PROP_FPS))
+    print(f"[INFO] Camera capturing at {actual[0]}x{actual[1]} @ {actual[2]:.0f} fps")
+    return actual
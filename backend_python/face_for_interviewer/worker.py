@@ -0,0 +1,246 @@
+import multiprocessing as mp
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from multiprocessing import shared_memory
+
+import cv2
+import numpy as np
+
+from face_for_interviewer.main import CAPTURE_OPTIONS, InterviewCheatingDetector, open_camera
+
+# ------------------------------------------------------------------
+# OUT-OF-PROCESS VISION WORKER
+# ------------------------------------------------------------------
+# The parent keeps the camera and copies each frame into a shared-memory
+# ring; a child process runs MediaPipe/YOLO on the newest frame and sends
+# warnings / evidence JPEGs back over a multiprocessing queue. Inference
+# then never holds the GIL of the interpreter running audio and TTS.
+
+
+class SharedFrameRing:
+    """
+    Fixed-size ring of equally shaped uint8 frames in shared memory.
+
+    The header holds one sequence number per slot. The writer marks a slot
+    as busy (-1) while copying into it, so a reader picks the slot with the
+    highest finished sequence and re-checks it after copying to detect a
+    torn read.
+    """
+
+    def __init__(self, shape, slots=4, name=None, create=True):
+        self.shape = tuple(shape)
+        self.slots = slots
+        self.owner = create
+        frame_nbytes = int(np.prod(self.shape))
+        header = 8 * slots
+
+        self.shm = shared_memory.SharedMemory(name=name, create=create, size=header + frame_nbytes * slots)
+        self._seq = np.ndarray((slots,), dtype=np.int64, buffer=self.shm.buf[:header])
+        self._frames = np.ndarray((slots,) + self.shape, dtype=np.uint8, buffer=self.shm.buf[header:])
+        if create:
+            self._seq[:] = 0
+        self._next = 1
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def write(self, frame):
+        if frame.shape != self.shape:
+            frame = cv2.resize(frame, (self.shape[1], self.shape[0]))
+        seq = self._next
+        slot = seq % self.slots
+        self._seq[slot] = -1
+        np.copyto(self._frames[slot], frame)
+        self._seq[slot] = seq
+        self._next += 1
+        return seq
+
+    def read_latest(self, after=0):
+        """Return (frame_copy, seq) for the newest frame newer than `after`, or (None, after)."""
+        for _ in range(3):
+            slot = int(np.argmax(self._seq))
+            seq = int(self._seq[slot])
+            if seq <= after:
+                return None, after
+            frame = self._frames[slot].copy()
+            if int(self._seq[slot]) == seq:
+                return frame, seq
+        return None, after
+
+    def close(self):
+        self._seq = None
+        self._frames = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def _worker_main(ring_name, shape, slots, stop_event, channel, detector_options):
+    ring = SharedFrameRing(shape, slots, name=ring_name, create=False)
+    detector = None
+    try:
+        detector = InterviewCheatingDetector(use_camera=False, headless=True, **detector_options)
+        channel.put(("ready", None))
+
+        last_seq = 0
+        sent_warnings = 0
+        sent_evidence = None
+        while not stop_event.is_set():
+            frame, last_seq = ring.read_latest(last_seq)
+            if frame is None:
+                time.sleep(0.005)
+                continue
+
+            detector.process_frame(frame, stop_event)
+            sent_warnings, sent_evidence = _report(detector, channel, sent_warnings, sent_evidence)
+
+        detector.close()
+        _report(detector, channel, sent_warnings, sent_evidence)
+        channel.put(("clips", detector.evidence_clips))
+    except Exception as e:
+        channel.put(("error", repr(e)))
+    finally:
+        channel.put(("done", detector.stage_runs if detector else {}))
+        ring.close()
+
+
+def _report(detector, channel, sent_warnings, sent_evidence):
+    if detector.latest_frame_bytes is not sent_evidence:
+        sent_evidence = detector.latest_frame_bytes
+        channel.put(("evidence", sent_evidence))
+    while sent_warnings < len(detector.warnings):
+        channel.put(("warning", detector.warnings[sent_warnings]))
+        sent_warnings += 1
+    return sent_warnings, sent_evidence
+
+
+class VisionProcess:
+    """
+    Drop-in stand-in for InterviewCheatingDetector that runs detection in a
+    child process. `warnings`, `latest_frame_bytes`, `ready` and
+    run(stop_event) keep the same contract for controler.py: run() blocks
+    until stop_event is set (by the caller, or by the child after repeated
+    violations); `ready` resolves once the child has loaded its models,
+    independently of run(), so it can be awaited before run() is started.
+    With async_start the camera is opened and the child spawned in the
+    background, and a startup failure surfaces through `ready`.
+    """
+
+    def __init__(self, camera_index=0, slots=4, async_start=False, **detector_options):
+        self.warnings = []
+        self.latest_frame_bytes = None
+        self.stage_runs = {}
+        self.evidence_clips = []
+        self.ready = Future()
+        self.cap = None
+        self.ring = None
+        self.process = None
+        self._started = threading.Event()
+        self._done = threading.Event()
+
+        capture_options = {k: detector_options.pop(k) for k in CAPTURE_OPTIONS if k in detector_options}
+        startup_args = (camera_index, slots, capture_options, detector_options)
+        if async_start:
+            threading.Thread(target=self._startup, args=startup_args, daemon=True).start()
+        else:
+            self._startup(*startup_args)
+            if self.process is None:
+                self.ready.result()
+
+    def _startup(self, camera_index, slots, capture_options, detector_options):
+        try:
+            self.cap, self.camera_index = open_camera(camera_index, **capture_options)
+            ret, frame = self.cap.read()
+            if not ret:
+                raise RuntimeError("❌ Could not read a frame from the camera!")
+
+            ctx = mp.get_context("spawn")
+            self.ring = SharedFrameRing(frame.shape, slots)
+            self.ring.write(frame)
+            self._stop = ctx.Event()
+            self._channel = ctx.Queue()
+            process = ctx.Process(
+                target=_worker_main,
+                args=(self.ring.name, frame.shape, slots, self._stop, self._channel, detector_options),
+                daemon=True,
+            )
+            process.start()
+            self.process = process
+            # resolves `ready` (and collects warnings) even before run() is started
+            threading.Thread(target=self._read_channel, daemon=True).start()
+        except Exception as e:
+            if self.cap is not None:
+                self.cap.release()
+            if self.ring is not None:
+                self.ring.close()
+            self.ready.set_exception(e)
+        finally:
+            self._started.set()
+
+    def _read_channel(self):
+        """Apply the child's messages as they arrive, whether or not run() is running yet."""
+        while True:
+            try:
+                kind, payload = self._channel.get(timeout=0.5)
+            except queue.Empty:
+                if self.process.is_alive():
+                    continue
+                break  # died without saying goodbye
+            if kind == "warning":
+                self.warnings.append(payload)
+            elif kind == "evidence":
+                self.latest_frame_bytes = payload
+            elif kind == "clips":
+                self.evidence_clips = payload
+            elif kind == "error":
+                print("❌ Vision worker failed:", payload)
+                if not self.ready.done():
+                    self.ready.set_exception(RuntimeError(payload))
+            elif kind == "done":
+                self.stage_runs = payload
+                break
+            elif kind == "ready":
+                print(f"[INFO] Vision worker ready (pid {self.process.pid})")
+                self.ready.set_result(self)
+        if not self.ready.done():
+            self.ready.set_exception(RuntimeError("Vision worker exited before it was ready"))
+        self._done.set()
+
+    def run(self, stop_event):
+        self._started.wait()
+        if self.process is None:
+            print("❌ Vision module failed to start:", self.ready.exception())
+            return self.warnings
+
+        print(f"[INFO] Cheating detector (worker process) running on camera index {self.camera_index}...")
+        try:
+            while not self._done.is_set() and self.cap.isOpened():
+                if stop_event.is_set():
+                    self._stop.set()
+                elif self._stop.is_set():
+                    stop_event.set()
+
+                if self._stop.is_set() or not self.process.is_alive():
+                    break
+
+                ret, frame = self.cap.read()
+                if not ret:
+                    print("⚠️ Frame read failed, skipping...")
+                    time.sleep(0.2)
+                else:
+                    self.ring.write(frame)
+        finally:
+            self._stop.set()
+            self.cap.release()
+            # the reader keeps draining the queue; a child with unflushed items cannot exit
+            self._done.wait(timeout=10.0)
+            self.process.join(timeout=1.0)
+            if self.process.is_alive():
+                self.process.terminate()
+            self.ring.close()
+
+        print("[INFO] Camera released and vision worker stopped.")
+        return self.warnings
@@ -0,0 +1,248 @@
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+import weakref
+
+import httpx
+
+# ------------------------------------------------------------------
+# SHARED LLM GATEWAY
+# ------------------------------------------------------------------
+# One gateway per provider, shared by every module that talks to an LLM.
+# Each gateway holds a pooled HTTP client, applies a per-call timeout, retries
+# rate-limit / server / network errors with jittered exponential backoff
+# (honouring Retry-After) and caps the number of calls in flight.
+#
+#   await get_gateway("openai").achat(messages, model=...)   # from async code
+#   get_gateway("groq").chat(messages, model=...)            # from threads / scripts
+#
+# `retries` / `backoff` can be overridden per call without touching the
+# shared gateway's defaults.
+#
+# The async client and semaphore are created per event loop, the sync client
+# is shared by all threads.
+
+logger = logging.getLogger(__name__)
+
+PROVIDERS = {
+    # name: (env var with the API key, sdk module, sync class, async class)
+    "groq": ("GROQ_API_KEY", "groq", "Groq", "AsyncGroq"),
+    "openai": ("OPENAI_API_KEY", "openai", "OpenAI", "AsyncOpenAI"),
+}
+
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+
+def _env_float(name, default):
+    return float(os.getenv(name, default))
+
+
+def _given(options):
+    # None means "not set"; let the SDK apply its own default
+    return {k: v for k, v in options.items() if v is not None}
+
+
+class LLMGateway:
+    def __init__(self, provider, api_key=None, timeout=None, retries=None, backoff=None, max_backoff=8.0,
+                 max_concurrency=None, max_connections=None):
+        key_env, module, sync_cls, async_cls = PROVIDERS[provider]
+        sdk = __import__(module)
+
+        self.provider = provider
+        self._api_key = api_key
+        self._key_env = key_env
+        self.timeout = timeout or _env_float("LLM_TIMEOUT", 30.0)
+        self.retries = retries if retries is not None else int(os.getenv("LLM_RETRIES", "3"))
+        self.backoff = backoff or _env_float("LLM_BACKOFF", 0.5)
+        self.max_backoff = max_backoff
+        self.max_concurrency = max_concurrency or int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+        self.limits = httpx.Limits(
+            max_connections=max_connections or self.max_concurrency,
+            max_keepalive_connections=max_connections or self.max_concurrency,
+        )
+        self._sync_cls = getattr(sdk, sync_cls)
+        self._async_cls = getattr(sdk, async_cls)
+
+        self._sync_client = None
+        self._sync_lock = threading.Lock()
+        self._sync_slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._loops = weakref.WeakKeyDictionary()  # event loop -> (async client, semaphore)
+
+        self.calls = 0
+        self.retried = 0
+        self.failures = 0
+
+    # ---------------- clients ----------------
+
+    @property
+    def api_key(self):
+        # read at first use so a .env loaded after import (e.g. resume/.env) still applies
+        return self._api_key or os.getenv(self._key_env)
+
+    def _sync(self):
+        with self._sync_lock:
+            if self._sync_client is None:
+                self._sync_client = self._sync_cls(
+                    api_key=self.api_key,
+                    timeout=self.timeout,
+                    max_retries=0,
+                    http_client=httpx.Client(limits=self.limits, timeout=self.timeout),
+                )
+            return self._sync_client
+
+    def _async(self):
+        loop = asyncio.get_running_loop()
+        state = self._loops.get(loop)
+        if state is None:
+            client = self._async_cls(
+                api_key=self.api_key,
+                timeout=self.timeout,
+                max_retries=0,
+                http_client=httpx.AsyncClient(limits=self.limits, timeout=self.timeout),
+            )
+            state = self._loops[loop] = (client, asyncio.Semaphore(self.max_concurrency))
+        return state
+
+    # ---------------- retry policy ----------------
+
+    def _retry_delay(self, exc, attempt, retries=None, backoff=None):
+        """Seconds to wait before the next attempt, or None if `exc` should not be retried."""
+        if attempt >= (self.retries if retries is None else retries):
+            return None
+
+        status = getattr(exc, "status_code", None)
+        transient = type(exc).__name__ in ("APITimeoutError", "APIConnectionError") or isinstance(
+            exc, (httpx.TransportError, asyncio.TimeoutError)
+        )
+        if not transient and status not in RETRYABLE_STATUS:
+            return None
+
+        response = getattr(exc, "response", None)
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), self.max_backoff)
+            except ValueError:
+                pass
+        # full jitter so concurrent callers don't retry in lockstep
+        backoff = self.backoff if backoff is None else backoff
+        return random.uniform(0, min(self.max_backoff, backoff * 2 ** attempt))
+
+    def _log_retry(self, exc, delay, attempt, retries=None):
+        self.retried += 1
+        logger.warning("%s call failed (%s); retry %d/%d in %.2fs",
+                       self.provider, exc, attempt + 1, self.retries if retries is None else retries, delay)
+
+    # ---------------- calls ----------------
+
+    def chat(self, messages, model, temperature=0, timeout=None, retries=None, backoff=None, **kwargs):
+        """Blocking chat completion; returns the message text."""
+        client = self._sync()
+        attempt = 0
+        with self._sync_slots:
+            while True:
+                self.calls += 1
+                try:
+                    response = client.chat.completions.create(
+                        model=model, messages=messages, temperature=temperature,
+                        timeout=timeout or self.timeout, **_given(kwargs)
+                    )
+                    return response.choices[0].message.content
+                except Exception as e:
+                    delay = self._retry_delay(e, attempt, retries, backoff)
+                    if delay is None:
+                        self.failures += 1
+                        raise
+                    self._log_retry(e, delay, attempt, retries)
+                    time.sleep(delay)
+                    attempt += 1
+
+    async def achat(self, messages, model, temperature=0, timeout=None, retries=None, backoff=None, **kwargs):
+        """Async chat completion; returns the message text."""
+        client, slots = self._async()
+        attempt = 0
+        async with slots:
+            while True:
+                self.calls += 1
+                try:
+                    response = await client.chat.completions.create(
+                        model=model, messages=messages, temperature=temperature,
+                        timeout=timeout or self.timeout, **_given(kwargs)
+                    )
+                    return response.choices[0].message.content
+                except Exception as e:
+                    delay = self._retry_delay(e, attempt, retries, backoff)
+                    if delay is None:
+                        self.failures += 1
+                        raise
+                    self._log_retry(e, delay, attempt, retries)
+                    await asyncio.sleep(delay)
+                    attempt += 1
+
+    async def astream(self, messages, model, temperature=0, timeout=None, retries=None, backoff=None, **kwargs):
+        """
+        Async chat completion yielding text deltas as they arrive. Failures
+        before the first delta are retried like achat(); once text has been
+        yielded an error is raised to the caller instead of replaying it.
+        """
+        client, slots = self._async()
+        attempt = 0
+        async with slots:
+            while True:
+                self.calls += 1
+                started = False
+                stream = None
+                try:
+                    stream = await client.chat.completions.create(
+                        model=model, messages=messages, temperature=temperature,
+                        timeout=timeout or self.timeout, stream=True, **_given(kwargs)
+                    )
+                    async for chunk in stream:
+                        delta = chunk.choices[0].delta.content if chunk.choices else None
+                        if delta:
+                            started = True
+                            yield delta
+                    return
+                except Exception as e:
+                    delay = None if started else self._retry_delay(e, attempt, retries, backoff)
+                    if delay is None:
+                        self.failures += 1
+                        raise
+                    self._log_retry(e, delay, attempt, retries)
+                    await asyncio.sleep(delay)
+                    attempt += 1
+                finally:
+                    if stream is not None:
+                        await stream.close()
+
+    async def aclose(self):
+        # async clients are bound to their loop; close the one owned by the caller's loop
+        state = self._loops.pop(asyncio.get_running_loop(), None)
+        if state is not None:
+            await state[0].close()
+        if self._sync_client is not None:
+            self._sync_client.close()
+            self._sync_client = None
+
+    def stats(self):
+        return {"calls": self.calls, "retried": self.retried, "failures": self.failures}
+
+
+_GATEWAYS = {}
+_GATEWAYS_LOCK = threading.Lock()
+
+
+def get_gateway(provider="groq"):
+    with _GATEWAYS_LOCK:
+        gateway = _GATEWAYS.get(provider)
+        if gateway is None:
+            gateway = _GATEWAYS[provider] = LLMGateway(provider)
+        return gateway
+
+
+async def close_gateways():
+    for gateway in list(_GATEWAYS.values()):
+        await gateway.aclose()
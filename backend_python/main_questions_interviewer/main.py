@@ -1,13 +1,14 @@
-import os
 import json
 import re
 import random
-from groq import Groq
 from dotenv import load_dotenv
 
 # Load API key
 load_dotenv()
-client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+
+from llm_gateway import get_gateway
+
+llm = get_gateway("groq")
 
 def safe_json_loads(text: str):
     """Clean and safely parse JSON from model output."""
@@ -94,10 +95,10 @@ TASK:
 Generate the *next interviewer line only* — short, realistic, context-aware, and aligned with your personality.
 """
 
-    response = client.chat.completions.create(
+    response = llm.chat(
+        [{"role": "user", "content": prompt}],
         model="llama-3.3-70b-versatile",
-        messages=[{"role": "user", "content": prompt}],
         temperature=0.8
     )
-    
-    return response.choices[0].message.content.strip()
\ No newline at end of file
+
+    return response.strip()
\ No newline at end of file
@@ -6,9 +6,11 @@ import fitz  # PyMuPDF
 import numpy as np
 import hashlib
 import logging
+import threading
 from pathlib import Path
 from dotenv import load_dotenv
-from groq import Groq
+from llm_gateway import get_gateway
+from resume.preparse import offline_resume, preparse
 
 # ------------------------------------------------------------------
 # ENV SETUP (force load .env from resume folder)
@@ -17,10 +19,12 @@ env_path = Path(__file__).parent / ".env"
 load_dotenv(dotenv_path=env_path)
 
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
-if not GROQ_API_KEY:
-    raise RuntimeError("GROQ_API_KEY not found in environment")
 
-client = Groq(api_key=GROQ_API_KEY)
+# "auto": use the LLM and fall back to the local pre-parse if it fails;
+# "offline": never call the LLM
+RESUME_LLM_MODE = os.getenv("RESUME_LLM_MODE", "auto")
+
+llm = get_gateway("groq") if GROQ_API_KEY else None
 
 # ------------------------------------------------------------------
 # LOGGING
@@ -42,51 +46,37 @@ face_cascade = cv2.CascadeClassifier(
 # ------------------------------------------------------------------
 # LLM PROMPT
 # ------------------------------------------------------------------
+LLM_MODEL = "llama-3.3-70b-versatile"
+
+# bump when extraction / parsing changes so old cache entries are ignored
+PARSER_VERSION = "4"
+
+# The contacts block (except the address) and, when a skills section exists,
+# the skills list come from resume.preparse; the LLM is only asked for the
+# fields listed in {fields} and only sees the cleaned sections.
+FIELD_SCHEMAS = {
+    "name": '"name": "string"',
+    "profession": '"profession": "string"',
+    "address": '"address": "string"',
+    "summary": '"summary": "string"',
+    "skills": '"skills": ["string"]',
+    "education": '"education": [{"degree": "string", "institution": "string", "year": "string"}]',
+    "projects": '"projects": [{"title": "string", "description": "string", "technologies": ["string"]}]',
+    "experience": '"experience": [{"role": "string", "company": "string", "duration": "string", "achievements": ["string"]}]',
+}
+
 PROMPT_TEMPLATE = """
 You are an expert resume parser.
-I will give you raw extracted resume text. You must return only valid JSON,
-following this schema:
-
-{{ 
-  "name": "string",
-  "profession": "string",
-  "contacts": {{
-    "email": "string",
-    "phone": "string",
-    "linkedin": "string",
-    "github": "string",
-    "address": "string"
-  }},
-  "summary": "string",
-  "skills": ["string"],
-  "education": [
-    {{
-      "degree": "string",
-      "institution": "string",
-      "year": "string"
-    }}
-  ],
-  "projects": [
-    {{
-      "title": "string",
-      "description": "string",
-      "technologies": ["string"]
-    }}
-  ],
-  "experience": [
-    {{
-      "role": "string",
-      "company": "string",
-      "duration": "string",
-      "achievements": ["string"]
-    }}
-  ]
+I will give you resume text already split into sections. You must return only
+valid JSON with exactly these keys:
+
+{{
+  {fields}
 }}
 
 If some fields are missing in the resume, leave them as empty strings or empty arrays.
-Make sure the JSON is valid and strictly follows the schema.
 
-RESUME TEXT:
+RESUME:
 {text}
 """
 
@@ -98,45 +88,98 @@ def sha1_of_bytes(b: bytes) -> str:
     return hashlib.sha1(b).hexdigest()
 
 
-def contains_face_bytes(img_bytes: bytes) -> bool:
-    nparr = np.frombuffer(img_bytes, np.uint8)
-    img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-    if img is None:
+# images smaller than this (either side, in pixels) are icons / logos, not photos
+MIN_FACE_IMAGE_SIDE = 64
+# longest side the Haar cascade sees; larger photos are decoded at 1/2, 1/4 or 1/8
+FACE_SCAN_MAX_SIDE = 640
+
+
+def _reduced_read_flag(width: int, height: int):
+    """Pick the libjpeg/libpng reduced decode mode that keeps the image above FACE_SCAN_MAX_SIDE."""
+    longest = max(width, height)
+    for factor, flag in (
+        (8, cv2.IMREAD_REDUCED_GRAYSCALE_8),
+        (4, cv2.IMREAD_REDUCED_GRAYSCALE_4),
+        (2, cv2.IMREAD_REDUCED_GRAYSCALE_2),
+    ):
+        if longest // factor >= FACE_SCAN_MAX_SIDE:
+            return factor, flag
+    return 1, cv2.IMREAD_GRAYSCALE
+
+
+def contains_face_bytes(img_bytes: bytes, width: int = 0, height: int = 0) -> bool:
+    factor, flag = _reduced_read_flag(width, height)
+    gray = cv2.imdecode(np.frombuffer(img_bytes, np.uint8), flag)
+    if gray is None:
         return False
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    min_side = max(24, 30 // factor)
     faces = face_cascade.detectMultiScale(
-        gray, scaleFactor=1.2, minNeighbors=5, minSize=(30, 30)
+        gray, scaleFactor=1.2, minNeighbors=5, minSize=(min_side, min_side)
     )
     return len(faces) > 0
 
 
-def extract_text_from_pdf(pdf_path: Path) -> str:
-    doc = fitz.open(str(pdf_path))
+def _open_pdf(pdf):
+    if isinstance(pdf, (bytes, bytearray)):
+        return fitz.open(stream=pdf, filetype="pdf")
+    return fitz.open(str(pdf))
+
+
+def extract_pdf(pdf, find_face: bool = True):
+    """
+    One pass over the document: returns (text, face_bytes | None).
+
+    Text blocks of every page are collected in reading order; embedded images
+    are only looked at until the first face is found. Images are deduped by
+    xref and content hash, icons below MIN_FACE_IMAGE_SIDE are skipped before
+    they are extracted, and large photos are decoded at reduced resolution.
+    `pdf` may be a path or the raw PDF bytes.
+    """
+    doc = _open_pdf(pdf)
     merged_text = []
+    face_bytes = None
+    seen_xrefs = set()
+    seen_hashes = set()
+
+    try:
+        for i, page in enumerate(doc, start=1):
+            blocks = page.get_text("blocks")
+            blocks = sorted(blocks, key=lambda b: (round(b[1], 1), round(b[0], 1)))
+            text_content = "\n".join(b[4].strip() for b in blocks if b[4].strip())
+            merged_text.append(f"\n\n--- PAGE {i} ---\n\n{text_content}")
+
+            if not find_face or face_bytes is not None:
+                continue
+
+            for img in page.get_images(full=True):
+                xref, width, height = img[0], img[2], img[3]
+                if xref in seen_xrefs:
+                    continue
+                seen_xrefs.add(xref)
+                if min(width, height) < MIN_FACE_IMAGE_SIDE:
+                    continue
+
+                img_bytes = doc.extract_image(xref)["image"]
+                digest = sha1_of_bytes(img_bytes)
+                if digest in seen_hashes:
+                    continue
+                seen_hashes.add(digest)
+
+                if contains_face_bytes(img_bytes, width, height):
+                    face_bytes = img_bytes
+                    break
+    finally:
+        doc.close()
+
+    return "\n".join(merged_text), face_bytes
 
-    for i, page in enumerate(doc, start=1):
-        blocks = page.get_text("blocks")
-        blocks = sorted(blocks, key=lambda b: (round(b[1], 1), round(b[0], 1)))
-        text_content = "\n".join(b[4].strip() for b in blocks if b[4].strip())
-        merged_text.append(f"\n\n--- PAGE {i} ---\n\n{text_content}")
 
-    doc.close()
-    return "\n".join(merged_text)
+def extract_text_from_pdf(pdf_path: Path) -> str:
+    return extract_pdf(pdf_path, find_face=False)[0]
 
 
 def extract_first_face_bytes(pdf_path: Path):
-    doc = fitz.open(str(pdf_path))
-    for page_index in range(len(doc)):
-        page = doc[page_index]
-        for img in page.get_images(full=True):
-            xref = img[0]
-            base_image = doc.extract_image(xref)
-            img_bytes = base_image["image"]
-            if contains_face_bytes(img_bytes):
-                doc.close()
-                return img_bytes
-    doc.close()
-    return None
+    return extract_pdf(pdf_path)[1]
 
 
 def clean_json_response(raw: str) -> str:
@@ -145,37 +188,198 @@ def clean_json_response(raw: str) -> str:
     return match.group(0) if match else cleaned
 
 
-def parse_resume_with_llm(text: str) -> dict:
-    response = client.chat.completions.create(
-        model="llama-3.3-70b-versatile",
-        messages=[
-            {
-                "role": "system",
-                "content": "You are an expert resume parser. Output ONLY valid JSON."
-            },
-            {
-                "role": "user",
-                "content": PROMPT_TEMPLATE.format(text=text)
-            }
-        ],
-        temperature=0
-    )
+def build_prompt(pre: dict):
+    """Returns (prompt, fields asked for) for the trimmed LLM call."""
+    fields = ["name", "profession", "address", "summary", "education", "projects", "experience"]
+    if not pre["skills"]:
+        fields.append("skills")
+
+    parts = []
+    if pre["header"]:
+        parts.append("[HEADER]\n" + "\n".join(pre["header"]))
+    for name, body in pre["sections"].items():
+        if name == "ignored" or not body or (name == "skills" and pre["skills"]):
+            continue
+        parts.append(f"[{name.upper()}]\n" + "\n".join(body))
+
+    schema = ",\n  ".join(FIELD_SCHEMAS[f] for f in fields)
+    return PROMPT_TEMPLATE.format(fields=schema, text="\n\n".join(parts)), fields
 
-    raw_output = response.choices[0].message.content.strip()
-    cleaned_output = clean_json_response(raw_output)
-    return json.loads(cleaned_output)
+
+def merge_resume(pre: dict, parsed: dict, fields) -> dict:
+    """Full resume schema from the pre-parse plus the LLM's answer."""
+    contacts = dict(pre["contacts"])
+    contacts["address"] = parsed.get("address", "") or ""
+    resume = offline_resume(pre)
+    resume["contacts"] = contacts
+    for field in fields:
+        if field != "address" and field in parsed:
+            resume[field] = parsed[field]
+    return resume
+
+
+def parse_resume_with_llm(text: str, fallback: bool = True, retries=None, backoff=None) -> dict:
+    """
+    Parse extracted resume text into the resume schema. Contacts and a plain
+    skills list are taken from the local pre-parse; the LLM structures the
+    rest. With `fallback`, an unavailable or failing LLM yields the offline
+    pre-parse instead (marked "parse_mode": "offline"). `retries` / `backoff`
+    override the gateway's retry policy for this call only.
+    """
+    pre = preparse(text)
+    if llm is None or RESUME_LLM_MODE == "offline":
+        if not fallback:
+            raise RuntimeError("LLM resume parsing is unavailable (no GROQ_API_KEY or RESUME_LLM_MODE=offline)")
+        return {**offline_resume(pre), "parse_mode": "offline"}
+
+    prompt, fields = build_prompt(pre)
+    try:
+        raw_output = llm.chat(
+            [
+                {
+                    "role": "system",
+                    "content": "You are an expert resume parser. Output ONLY valid JSON."
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            model=LLM_MODEL,
+            temperature=0,
+            retries=retries,
+            backoff=backoff
+        ).strip()
+        parsed = json.loads(clean_json_response(raw_output))
+        if not isinstance(parsed, dict):
+            raise ValueError(f"expected a JSON object, got {type(parsed).__name__}")
+        resume = merge_resume(pre, parsed, fields)
+    except Exception as e:
+        if not fallback:
+            raise
+        logger.warning("LLM resume parse failed (%s); using the offline pre-parse", e)
+        return {**offline_resume(pre), "parse_mode": "offline"}
+
+    return {**resume, "parse_mode": "llm"}
+
+
+# ------------------------------------------------------------------
+# RESULT CACHE
+# ------------------------------------------------------------------
+class ResumeCache:
+    """
+    Content-addressed on-disk cache of process_resume results.
+
+    Entries are keyed by the SHA-1 of the PDF bytes plus a fingerprint of the
+    prompt, model and PARSER_VERSION, so the same file uploaded twice (or
+    parsed again on every interview start) skips extraction, the face scan
+    and the LLM call, while a prompt/model change invalidates old entries.
+    Each entry is <key>.json (structured data) and an optional <key>.face
+    (image bytes); least recently used entries are evicted past max_bytes.
+    """
+
+    def __init__(self, cache_dir, max_bytes):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def fingerprint():
+        raw = f"{PROMPT_TEMPLATE}\x00{LLM_MODEL}\x00{PARSER_VERSION}".encode("utf-8")
+        return sha1_of_bytes(raw)[:12]
+
+    def key(self, pdf_bytes: bytes) -> str:
+        return self.key_for_digest(sha1_of_bytes(pdf_bytes))
+
+    def key_for_digest(self, pdf_sha1: str) -> str:
+        return f"{pdf_sha1}-{self.fingerprint()}"
+
+    def get(self, key):
+        json_path = self.cache_dir / f"{key}.json"
+        face_path = self.cache_dir / f"{key}.face"
+        try:
+            structured = json.loads(json_path.read_text(encoding="utf-8"))
+            face_bytes = face_path.read_bytes() if face_path.exists() else None
+            os.utime(json_path)
+        except (OSError, ValueError):
+            with self.lock:
+                self.misses += 1
+            return None
+
+        with self.lock:
+            self.hits += 1
+        return face_bytes, structured
+
+    def put(self, key, face_bytes, structured):
+        # the .json is the commit marker: write it last so a crash in between
+        # never leaves an entry that reads back as "no face"
+        if face_bytes:
+            self._write(self.cache_dir / f"{key}.face", face_bytes)
+        self._write(self.cache_dir / f"{key}.json", json.dumps(structured).encode("utf-8"))
+        self._evict()
+
+    def _write(self, path, data: bytes):
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+    def _evict(self):
+        with self.lock:
+            entries = {}
+            for path in self.cache_dir.iterdir():
+                if path.suffix not in (".json", ".face"):
+                    continue
+                st = path.stat()
+                mtime, size = entries.get(path.stem, (0, 0))
+                entries[path.stem] = (max(mtime, st.st_mtime), size + st.st_size)
+
+            total = sum(size for _, size in entries.values())
+            for key, (_, size) in sorted(entries.items(), key=lambda kv: kv[1][0]):
+                if total <= self.max_bytes:
+                    break
+                for suffix in (".json", ".face"):
+                    (self.cache_dir / f"{key}{suffix}").unlink(missing_ok=True)
+                total -= size
+
+    def stats(self):
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
+RESUME_CACHE_DIR = os.getenv("RESUME_CACHE_DIR", str(Path(__file__).parent / "cache"))
+RESUME_CACHE_MAX_BYTES = int(os.getenv("RESUME_CACHE_MAX_MB", "200")) * 1024 * 1024
+
+resume_cache = ResumeCache(RESUME_CACHE_DIR, RESUME_CACHE_MAX_BYTES)
 
 
 # ------------------------------------------------------------------
 # MAIN PUBLIC FUNCTION (USED BY BACKEND)
 # ------------------------------------------------------------------
-def process_resume(pdf_path: Path):
+def process_resume(pdf_path: Path, use_cache: bool = True):
     """
     Returns:
       face_bytes (bytes | None),
       structured_resume (dict)
     """
-    text = extract_text_from_pdf(pdf_path)
+    pdf_bytes = Path(pdf_path).read_bytes()
+    key = None
+    if use_cache:
+        key = resume_cache.key(pdf_bytes)
+        cached = resume_cache.get(key)
+        if cached is not None:
+            logger.info("Resume cache hit for %s", pdf_path)
+            return cached
+
+    text, face_bytes = extract_pdf(pdf_bytes)
     structured_data = parse_resume_with_llm(text)
-    face_bytes = extract_first_face_bytes(pdf_path)
+
+    # don't pin a degraded parse in the cache; retry the LLM next time
+    if key and structured_data.get("parse_mode") != "offline":
+        try:
+            resume_cache.put(key, face_bytes, structured_data)
+        except OSError as e:
+            logger.warning("Could not write resume cache entry: %s", e)
     return face_bytes, structured_data
@@ -0,0 +1,193 @@
+#  ------------------------------------------------------------------------------------------------
+#  |   BATCH RESUME INGESTION - command ->  python -m resume.batch <dir> --out results.jsonl        |
+#  ------------------------------------------------------------------------------------------------
+#  Parses every PDF under a directory. Text extraction and the face scan run
+#  in a process pool across cores, the LLM parse calls run on a bounded
+#  thread pool (the shared gateway retries transient errors with jittered
+#  backoff; anything else fails the PDF straight away), and each result is appended
+#  to a JSONL file as soon as it is ready. Re-running the same command after a
+#  crash skips every PDF (by content hash) that already has an "ok" record.
+
+import argparse
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from resume.OCR import extract_pdf, parse_resume_with_llm, resume_cache, sha1_of_bytes
+
+logger = logging.getLogger(__name__)
+
+
+def find_pdfs(input_dir, recursive=True):
+    pattern = "**/*.pdf" if recursive else "*.pdf"
+    return sorted(p for p in Path(input_dir).glob(pattern) if p.is_file())
+
+
+def load_done(output_path):
+    """SHA-1s of PDFs that already have a successful record. A torn last line is ignored."""
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get("status") == "ok":
+                done.add(record["sha1"])
+    return done
+
+
+def _face_extension(face_bytes):
+    if face_bytes.startswith(b"\xff\xd8"):
+        return ".jpg"
+    if face_bytes.startswith(b"\x89PNG"):
+        return ".png"
+    return ".img"
+
+
+def _extract(path, use_cache):
+    """Process-pool job: returns the cached result or the extracted text + face."""
+    pdf_bytes = Path(path).read_bytes()
+    digest = sha1_of_bytes(pdf_bytes)
+    if use_cache:
+        cached = resume_cache.get(resume_cache.key_for_digest(digest))
+        if cached is not None:
+            face_bytes, structured = cached
+            return {"sha1": digest, "text": None, "face": face_bytes, "resume": structured}
+
+    text, face_bytes = extract_pdf(pdf_bytes)
+    return {"sha1": digest, "text": text, "face": face_bytes, "resume": None}
+
+
+def ingest_directory(input_dir, output_path, workers=None, llm_concurrency=4, retries=None, backoff=None,
+                     faces_dir=None, recursive=True, use_cache=True):
+    """
+    Parse every PDF under `input_dir` into `output_path` (JSONL, one record per PDF):
+      {"path", "sha1", "status": "ok" | "error", "resume", "face", "error"}
+    `retries` / `backoff` override the LLM gateway's retry policy for transient errors
+    on this batch's calls only.
+    Returns a summary dict with counts per outcome.
+    """
+    input_dir = Path(input_dir)
+    if faces_dir:
+        os.makedirs(faces_dir, exist_ok=True)
+
+    done = load_done(output_path)
+    pending = {}
+    skipped = 0
+    for path in find_pdfs(input_dir, recursive):
+        digest = sha1_of_bytes(path.read_bytes())
+        if digest in done or digest in pending.values():
+            skipped += 1
+            continue
+        pending[path] = digest
+
+    summary = {"total": len(pending) + skipped, "skipped": skipped, "ok": 0, "error": 0, "cached": 0}
+    logger.info("Batch: %d PDFs to parse, %d already done", len(pending), skipped)
+    if not pending:
+        return summary
+
+    # a crash can leave a half-written last line; start on a fresh one
+    if os.path.exists(output_path) and os.path.getsize(output_path):
+        with open(output_path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            needs_newline = f.read(1) != b"\n"
+    else:
+        needs_newline = False
+
+    with open(output_path, "a", encoding="utf-8") as out, \
+            ProcessPoolExecutor(max_workers=workers) as procs, \
+            ThreadPoolExecutor(max_workers=llm_concurrency) as llm:
+        if needs_newline:
+            out.write("\n")
+
+        def write(path, digest, resume=None, face_bytes=None, error=None):
+            face_path = None
+            if face_bytes and faces_dir:
+                face_path = os.path.join(faces_dir, digest + _face_extension(face_bytes))
+                with open(face_path, "wb") as f:
+                    f.write(face_bytes)
+            record = {
+                "path": str(path.relative_to(input_dir)),
+                "sha1": digest,
+                "status": "error" if error else "ok",
+                "resume": resume,
+                "face": face_path,
+                "error": error,
+            }
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+            summary[record["status"]] += 1
+
+        def write_finished(futures):
+            for fut in [f for f in futures if f.done()]:
+                path, item = futures.pop(fut)
+                try:
+                    resume = fut.result()
+                except Exception as e:
+                    write(path, item["sha1"], error=f"llm: {e}")
+                    continue
+                if use_cache:
+                    try:
+                        resume_cache.put(resume_cache.key_for_digest(item["sha1"]), item["face"], resume)
+                    except OSError as e:
+                        logger.warning("Could not write resume cache entry: %s", e)
+                write(path, item["sha1"], resume, item["face"])
+
+        extract_futures = {procs.submit(_extract, str(path), use_cache): path for path in pending}
+        llm_futures = {}
+        for fut in as_completed(extract_futures):
+            path = extract_futures[fut]
+            try:
+                item = fut.result()
+            except Exception as e:
+                write(path, pending[path], error=f"extract: {e}")
+                continue
+
+            if item["resume"] is not None:
+                summary["cached"] += 1
+                write(path, item["sha1"], item["resume"], item["face"])
+            else:
+                llm_futures[llm.submit(parse_resume_with_llm, item["text"], False, retries, backoff)] = (path, item)
+            write_finished(llm_futures)
+
+        for _ in as_completed(list(llm_futures)):
+            write_finished(llm_futures)
+
+    logger.info("Batch finished: %s", summary)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parse a directory of resumes into JSONL")
+    parser.add_argument("input_dir")
+    parser.add_argument("--out", default="resumes.jsonl", help="JSONL output; re-running resumes it")
+    parser.add_argument("--workers", type=int, help="extraction processes (default: CPU count)")
+    parser.add_argument("--llm-concurrency", type=int, default=4)
+    parser.add_argument("--retries", type=int, help="LLM retries on transient errors (default: $LLM_RETRIES)")
+    parser.add_argument("--backoff", type=float, help="base retry delay in seconds (default: $LLM_BACKOFF)")
+    parser.add_argument("--faces-dir", help="write extracted face photos here")
+    parser.add_argument("--no-recursive", action="store_true")
+    parser.add_argument("--no-cache", action="store_true")
+    args = parser.parse_args()
+
+    summary = ingest_directory(
+        args.input_dir,
+        args.out,
+        workers=args.workers,
+        llm_concurrency=args.llm_concurrency,
+        retries=args.retries,
+        backoff=args.backoff,
+        faces_dir=args.faces_dir,
+        recursive=not args.no_recursive,
+        use_cache=not args.no_cache,
+    )
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+import re
+from collections import Counter
+
+# ------------------------------------------------------------------
+# LOCAL PRE-PARSER
+# ------------------------------------------------------------------
+# Deterministic first pass over the extracted resume text: strips page
+# markers and repeated headers/footers, pulls contacts out with regexes and
+# splits the text into sections, so the LLM only has to structure the hard
+# parts. offline_resume() turns the same result into the full resume schema
+# when no LLM is available.
+
+EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+PHONE_RE = re.compile(r"(?<![\w/])\+?\d[\d ().-]{7,}\d(?![\w/])")
+LINKEDIN_RE = re.compile(r"(?:https?://)?(?:[a-z]{2,3}\.)?linkedin\.com/(?:in|pub)/[\w%-]+/?", re.IGNORECASE)
+GITHUB_RE = re.compile(r"(?:https?://)?(?:www\.)?github\.com/[\w-]+/?", re.IGNORECASE)
+YEAR_RE = re.compile(r"\b(?:19|20)\d{2}\b(?:\s*[-–]\s*(?:(?:19|20)\d{2}|present|current|now))?", re.IGNORECASE)
+
+# "01/2020 - 05/2023", "2019 - 2023", "12.05.2021": dates that look like phone digits
+DATE_LIKE_RE = re.compile(
+    r"/|\b(?:19|20)\d{2}\s*[-–]\s*(?:\d{1,2}[/.-])?(?:19|20)\d{2}\b|\b\d{1,2}[.-]\d{1,2}[.-]\d{2,4}\b"
+)
+
+PAGE_MARKER_RE = re.compile(r"^\s*--- PAGE \d+ ---\s*$")
+PAGE_NUMBER_RE = re.compile(r"^\s*(?:page\s*)?\d+\s*(?:(?:/|of)\s*\d+)?\s*$", re.IGNORECASE)
+
+SECTION_ALIASES = {
+    "summary": ["summary", "professional summary", "profile", "objective", "career objective", "about me"],
+    "education": ["education", "academic background", "academics", "qualifications", "educational qualifications"],
+    "experience": ["experience", "work experience", "professional experience", "employment history",
+                   "employment", "internships", "internship", "work history"],
+    "projects": ["projects", "personal projects", "academic projects", "key projects"],
+    "skills": ["skills", "technical skills", "core competencies", "technologies", "tech stack", "key skills"],
+    "certifications": ["certifications", "certificates", "courses", "achievements", "awards"],
+    # boilerplate the LLM never needs to see
+    "ignored": ["hobbies", "interests", "references", "declaration", "personal details", "languages known"],
+}
+_HEADING_TO_SECTION = {alias: name for name, aliases in SECTION_ALIASES.items() for alias in aliases}
+
+SKILL_SEPARATORS = set(",;|•·▪●\n")
+BRACKETS = {"(": ")", "[": "]", "{": "}"}
+
+
+def clean_lines(text: str):
+    """Drop page markers, page numbers and lines repeated on every page (running headers/footers)."""
+    pages = [[]]
+    for line in text.splitlines():
+        if PAGE_MARKER_RE.match(line):
+            if pages[-1]:
+                pages.append([])
+            continue
+        line = re.sub(r"\s+", " ", line).strip()
+        if line and not PAGE_NUMBER_RE.match(line):
+            pages[-1].append(line)
+
+    repeated = set()
+    if len(pages) > 1:
+        counts = Counter(line for page in pages for line in set(page))
+        repeated = {line for line, n in counts.items() if n == len(pages) and len(line) < 80}
+
+    return [line for page in pages for line in page if line not in repeated]
+
+
+def _heading(line: str):
+    key = line.strip(" :-–|").lower()
+    if len(key) > 40:
+        return None
+    return _HEADING_TO_SECTION.get(key)
+
+
+def segment_sections(lines):
+    """Returns {"header": [...], "<section>": [...]} in document order."""
+    sections = {"header": []}
+    current = "header"
+    for line in lines:
+        name = _heading(line)
+        if name:
+            current = name
+            sections.setdefault(current, [])
+            continue
+        sections[current].append(line)
+    return sections
+
+
+def phone_matches(text: str):
+    """PHONE_RE matches with 10-15 digits that are not dates or year ranges."""
+    for match in PHONE_RE.finditer(text):
+        candidate = match.group(0).strip()
+        digits = re.sub(r"\D", "", candidate)
+        if 10 <= len(digits) <= 15 and not DATE_LIKE_RE.search(candidate):
+            yield match
+
+
+def extract_contacts(text: str) -> dict:
+    def first(regex):
+        match = regex.search(text)
+        return match.group(0).rstrip("/.") if match else ""
+
+    phone = next(phone_matches(text), None)
+
+    return {
+        "email": first(EMAIL_RE),
+        "phone": phone.group(0).strip() if phone else "",
+        "linkedin": first(LINKEDIN_RE),
+        "github": first(GITHUB_RE),
+        "address": "",
+    }
+
+
+def split_skills(line: str):
+    """Split on skill separators that are not inside brackets: "Go (gin, echo), SQL" -> 2 items."""
+    items, current, closers = [], [], []
+    for ch in line:
+        if ch in BRACKETS:
+            closers.append(BRACKETS[ch])
+        elif closers and ch == closers[-1]:
+            closers.pop()
+        elif ch in SKILL_SEPARATORS and not closers:
+            items.append("".join(current))
+            current = []
+            continue
+        current.append(ch)
+    items.append("".join(current))
+    return items
+
+
+def extract_skills(lines):
+    skills = []
+    for line in lines:
+        # "Languages: Python, Go" -> drop the category label
+        label, sep, rest = line.partition(":")
+        if sep and not any(b in label for b in BRACKETS):
+            line = rest
+        for item in split_skills(line):
+            item = item.strip(" -–*")
+            if item and len(item) <= 40 and item.lower() not in (s.lower() for s in skills):
+                skills.append(item)
+    return skills
+
+
+def strip_contacts(line: str) -> str:
+    """Remove email / URL / phone tokens from a header line, keeping the rest (e.g. the address)."""
+    spans = [m.span() for regex in (EMAIL_RE, LINKEDIN_RE, GITHUB_RE) for m in regex.finditer(line)]
+    spans += [m.span() for m in phone_matches(line)]
+    for start, end in sorted(spans, reverse=True):
+        line = line[:start] + " " + line[end:]
+    # tidy the separators left between removed tokens
+    line = re.sub(r"\s*([|•·,;])\s*(?:[|•·,;]\s*)+", r" \1 ", line)
+    return re.sub(r"\s+", " ", line).strip(" |•·,;-–")
+
+
+def preparse(text: str) -> dict:
+    lines = clean_lines(text)
+    sections = segment_sections(lines)
+    header = [line for line in map(strip_contacts, sections["header"]) if line]
+    return {
+        "contacts": extract_contacts("\n".join(lines)),
+        "header": header,
+        "sections": {name: body for name, body in sections.items() if name != "header"},
+        "skills": extract_skills(sections.get("skills", [])),
+    }
+
+
+def offline_resume(pre: dict) -> dict:
+    """Best-effort resume in the full schema from the pre-parse alone (no LLM)."""
+    sections = pre["sections"]
+    header = pre["header"]
+
+    education = [
+        {"degree": line, "institution": "", "year": (YEAR_RE.search(line) or [""])[0]}
+        for line in sections.get("education", [])
+    ]
+    experience = []
+    if sections.get("experience"):
+        experience.append({"role": "", "company": "", "duration": "", "achievements": sections["experience"]})
+    projects = []
+    if sections.get("projects"):
+        projects.append({"title": "", "description": " ".join(sections["projects"]), "technologies": []})
+
+    return {
+        "name": header[0] if header else "",
+        "profession": header[1] if len(header) > 1 else "",
+        "contacts": pre["contacts"],
+        "summary": " ".join(sections.get("summary", [])),
+        "skills": pre["skills"],
+        "education": education,
+        "projects": projects,
+        "experience": experience,
+    }
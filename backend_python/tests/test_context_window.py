@@ -0,0 +1,116 @@
+import asyncio
+
+from Backend.services.context_window import ContextWindow
+
+
+class FakeLLM:
+    def __init__(self, reply="Covered earlier topics.", fail=False):
+        self.reply = reply
+        self.fail = fail
+        self.calls = 0
+
+    async def achat(self, messages, **kwargs):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("LLM down")
+        return self.reply
+
+
+def make_window(llm, **options):
+    options.setdefault("budget", 600)
+    options.setdefault("keep_turns", 2)
+    return ContextWindow("You are an interviewer.", llm=llm, **options)
+
+
+def add_turn(session, words=30):
+    session["turns"].append({"question": "question " * 5, "answer": "answer " * words})
+
+
+def prompt(window, session):
+    return asyncio.run(window.messages(session))
+
+
+def test_under_budget_keeps_every_turn():
+    llm = FakeLLM()
+    window = make_window(llm)
+    session = {}
+    window.start(session, {"name": "Jane"})
+    for _ in range(6):
+        add_turn(session)
+
+    messages = prompt(window, session)
+    assert llm.calls == 0
+    assert session["summarized_turns"] == 0
+    assert len(messages) == 2 + 2 * 6
+    assert session["context_tokens"] <= window.budget
+
+
+def test_fold_once_down_to_target():
+    llm = FakeLLM()
+    window = make_window(llm, fold_target=0.5)
+    session = {}
+    window.start(session, {"name": "Jane"})
+    while window.counter.count_messages(window._build(session, 0)) <= window.budget:
+        add_turn(session)
+
+    prompt(window, session)
+    assert llm.calls == 1
+    assert session["summary"] == llm.reply
+    assert 0 < session["summarized_turns"] <= len(session["turns"]) - window.keep_turns
+    summary_tokens = window.counter.count(session["summary"]) + 20
+    assert session["context_tokens"] <= window.budget * window.fold_target + summary_tokens
+
+    # the fold left headroom: the next turn does not summarize again
+    add_turn(session)
+    prompt(window, session)
+    assert llm.calls == 1
+
+
+def test_keep_turns_stay_verbatim_while_under_budget():
+    llm = FakeLLM()
+    window = make_window(llm, keep_turns=3, fold_target=0.05)
+    session = {}
+    window.start(session, {"name": "Jane"})
+    while window.counter.count_messages(window._build(session, 0)) <= window.budget:
+        add_turn(session)
+
+    prompt(window, session)
+    # the target cannot be reached without eating into the last keep_turns, and
+    # those fit the budget, so exactly they are kept
+    assert session["summarized_turns"] == len(session["turns"]) - window.keep_turns
+
+
+def test_newest_turn_stays_verbatim_over_budget():
+    llm = FakeLLM()
+    window = make_window(llm)
+    session = {}
+    window.start(session, {"name": "Jane"})
+    for _ in range(3):
+        add_turn(session)
+    add_turn(session, words=2000)
+
+    messages = prompt(window, session)
+    assert session["summarized_turns"] == len(session["turns"]) - 1
+    assert messages[-1]["content"] == session["turns"][-1]["answer"]
+
+
+def test_failed_summary_keeps_short_form():
+    llm = FakeLLM(fail=True)
+    window = make_window(llm)
+    session = {}
+    window.start(session, {"name": "Jane"})
+    while window.counter.count_messages(window._build(session, 0)) <= window.budget:
+        add_turn(session)
+
+    prompt(window, session)
+    assert llm.calls == 1
+    assert session["summary"].startswith("- Q: question")
+
+
+def test_session_without_context_state():
+    window = make_window(FakeLLM())
+    session = {"resume": "Jane Doe, Go developer", "answers": []}
+
+    messages = prompt(window, session)
+    assert session["turns"] == []
+    assert "Jane Doe" in messages[1]["content"]
@@ -0,0 +1,57 @@
+from resume.preparse import extract_contacts, extract_skills, preparse
+
+SAMPLE = """
+
+--- PAGE 1 ---
+
+Jane Doe
+Backend Engineer
+jane.doe@mail.com | +91 98765 43210 | 221B Baker Street, London
+linkedin.com/in/janedoe | github.com/jdoe
+Experience
+Acme Corp 01/2020 - 05/2023
+Built things
+Skills:
+Languages: Go (gin, echo), Python; SQL
+Docker • Kubernetes
+1 / 2
+
+--- PAGE 2 ---
+
+Projects
+Chatbot using FastAPI
+Hobbies
+Chess
+2 / 2
+"""
+
+
+def test_extract_contacts():
+    contacts = extract_contacts("jane.doe@mail.com\n+1 (555) 123-4567\nlinkedin.com/in/janedoe/\ngithub.com/jdoe")
+    assert contacts["email"] == "jane.doe@mail.com"
+    assert contacts["phone"] == "+1 (555) 123-4567"
+    assert contacts["linkedin"] == "linkedin.com/in/janedoe"
+    assert contacts["github"] == "github.com/jdoe"
+
+
+def test_extract_contacts_ignores_dates():
+    text = "Acme Corp 01/2020 - 05/2023\nUni 2015 - 2019, 2019-2023\nIssued 12.05.2021 - 13.06.2022"
+    assert extract_contacts(text)["phone"] == ""
+    assert extract_contacts(text + "\nPhone: 0300-1234567")["phone"] == "0300-1234567"
+
+
+def test_extract_skills():
+    skills = extract_skills(["Languages: Go (gin, echo), Python; SQL", "Docker • Kubernetes, python"])
+    assert skills == ["Go (gin, echo)", "Python", "SQL", "Docker", "Kubernetes"]
+
+
+def test_preparse():
+    pre = preparse(SAMPLE)
+
+    assert pre["contacts"]["phone"] == "+91 98765 43210"
+    # contact tokens are removed from the header, the rest of the line (address) stays
+    assert pre["header"] == ["Jane Doe", "Backend Engineer", "221B Baker Street, London"]
+    assert pre["sections"]["experience"] == ["Acme Corp 01/2020 - 05/2023", "Built things"]
+    assert pre["sections"]["projects"] == ["Chatbot using FastAPI"]
+    assert pre["sections"]["ignored"] == ["Chess"]
+    assert pre["skills"] == ["Go (gin, echo)", "Python", "SQL", "Docker", "Kubernetes"]
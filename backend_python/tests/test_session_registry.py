@@ -0,0 +1,42 @@
+import pytest
+
+from Backend.services.session_registry import MemoryRegistry, SqliteRegistry, StaleSessionError
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def registry(request, tmp_path):
+    if request.param == "memory":
+        return MemoryRegistry()
+    return SqliteRegistry(str(tmp_path / "live.db"))
+
+
+def test_put_bumps_version(registry):
+    session = {"answers": []}
+    registry.put("s1", session)
+    assert session["version"] == 1
+
+    stored = registry.get("s1")
+    stored["answers"].append("a1")
+    registry.put("s1", stored)
+    assert registry.get("s1") == {"answers": ["a1"], "version": 2}
+
+
+def test_stale_write_is_rejected(registry):
+    registry.put("s1", {"answers": []})
+    first, retry = registry.get("s1"), registry.get("s1")
+
+    first["answers"].append("a1")
+    registry.put("s1", first)
+
+    retry["answers"].append("a1 again")
+    with pytest.raises(StaleSessionError):
+        registry.put("s1", retry)
+    # the rejected write changes neither the stored session nor the caller's version
+    assert registry.get("s1") == {"answers": ["a1"], "version": 2}
+    assert retry["version"] == 1
+
+
+def test_get_returns_a_copy(registry):
+    registry.put("s1", {"answers": []})
+    registry.get("s1")["answers"].append("unsaved")
+    assert registry.get("s1")["answers"] == []
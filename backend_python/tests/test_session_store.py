@@ -0,0 +1,47 @@
+from Backend.services.session_store import SessionStore
+
+
+def make_session(session_id="s1", num_questions=2):
+    return {
+        "session_id": session_id,
+        "user_id": "u1",
+        "parsed_resume": {"name": "Jane Doe"},
+        "questions": [{"id": f"q{i + 1}", "text": f"Question {i + 1}"} for i in range(num_questions)],
+        "answers": [],
+        "current_index": 0,
+        "finished": False,
+        "report": None,
+    }
+
+
+def test_append_answer_index_guard(tmp_path):
+    store = SessionStore(str(tmp_path / "sessions.db"))
+    store.create(make_session())
+
+    assert store.append_answer("s1", "q1", "first", expect_index=0)
+    # a retry of the same submit still expects index 0 and must not be recorded again
+    assert not store.append_answer("s1", "q1", "first", expect_index=0)
+
+    session = store.load("s1")
+    assert session["current_index"] == 1
+    assert session["answers"] == [{"question_id": "q1", "answer": "first"}]
+
+
+def test_final_answer_needs_report(tmp_path):
+    store = SessionStore(str(tmp_path / "sessions.db"))
+    store.create(make_session())
+    store.append_answer("s1", "q1", "first")
+
+    assert not store.append_answer("s1", "q2", "second", expect_index=1)
+    assert store.load("s1")["current_index"] == 1
+
+    report = {"summary": "ok", "verdict": "Hire"}
+    assert store.append_answer("s1", "q2", "second", report, expect_index=1)
+    session = store.load("s1")
+    assert session["finished"]
+    assert session["report"] == report
+    assert [a["answer"] for a in session["answers"]] == ["first", "second"]
+
+    # nothing is written once the session is finished
+    assert not store.append_answer("s1", "q2", "again", report)
+    assert len(store.load("s1")["answers"]) == 2
@@ -1,80 +1,378 @@
 import pyaudio
 import wave
-import numpy as np
-import time
+import os
+import queue
+import threading
+from contextlib import contextmanager
 from pydub import AudioSegment
 import io, json
 from vosk import Model, KaldiRecognizer
+from text_to_voice.vad import VoiceActivityDetector
 
 CHUNK = 1024
 FORMAT = pyaudio.paInt16
 CHANNELS = 1
 RATE = 16000
-SILENCE_THRESHOLD = 600
-SILENCE_DURATION = 5.0
-
-def is_silent(data_chunk):
-    audio_data = np.frombuffer(data_chunk, dtype=np.int16)
-    rms = np.sqrt(np.mean(audio_data**2))
-    return rms < SILENCE_THRESHOLD
-
-def run_audio(stop_event=None):
-    audio = pyaudio.PyAudio()
-    stream = audio.open(format=FORMAT, channels=CHANNELS, rate=RATE,
-                        input=True, frames_per_buffer=CHUNK)
-
-    frames = []
-    silent_start = None
-
-    while True:
-        data = stream.read(CHUNK, exception_on_overflow=False)
-        frames.append(data)
-
-        if is_silent(data):
-            if silent_start is None:
-                silent_start = time.time()
-            elif time.time() - silent_start >= SILENCE_DURATION:
+
+# adaptive VAD
+END_OF_UTTERANCE = float(os.getenv("VAD_END_OF_UTTERANCE", "0.5"))
+VAD_HANGOVER = float(os.getenv("VAD_HANGOVER", "0.2"))
+START_TIMEOUT = float(os.getenv("VAD_START_TIMEOUT", "8.0"))
+MAX_UTTERANCE = float(os.getenv("VAD_MAX_UTTERANCE", "120.0"))
+
+VOSK_MODEL_PATH = os.getenv("VOSK_MODEL_PATH", "vosk-model-small-en-us-0.15")
+RECOGNIZER_POOL_SIZE = int(os.getenv("VOSK_POOL_SIZE", "2"))
+
+# ------------------------------------------------------------------
+# VOSK MODEL REGISTRY + RECOGNIZER POOL
+# ------------------------------------------------------------------
+_MODELS = {}
+_MODELS_LOCK = threading.Lock()
+
+
+def get_model(model_path=None):
+    """Load a Vosk model once per process and hand back the shared instance."""
+    model_path = model_path or VOSK_MODEL_PATH
+    with _MODELS_LOCK:
+        model = _MODELS.get(model_path)
+        if model is None:
+            model = Model(model_path)
+            _MODELS[model_path] = model
+        return model
+
+
+class RecognizerPool:
+    """
+    Fixed-size pool of KaldiRecognizer objects sharing one model.
+    Recognizers are reset before going back to the pool, so a checkout
+    always starts from a clean decoder state.
+    """
+
+    def __init__(self, model_path=None, size=None, rate=RATE):
+        self.model_path = model_path or VOSK_MODEL_PATH
+        self.size = max(1, size or RECOGNIZER_POOL_SIZE)
+        self.rate = rate
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._stats = {"checkouts": 0, "hits": 0, "misses": 0, "waits": 0}
+
+    def acquire(self, timeout=None):
+        try:
+            recognizer = self._idle.get_nowait()
+            self._count("hits")
+            return recognizer
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            create = self._created < self.size
+            if create:
+                self._created += 1
+                self._stats["checkouts"] += 1
+                self._stats["misses"] += 1
+
+        if create:
+            try:
+                return KaldiRecognizer(get_model(self.model_path), self.rate)
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+        self._count("waits")
+        return self._idle.get(timeout=timeout)
+
+    def release(self, recognizer):
+        recognizer.Reset()
+        self._idle.put(recognizer)
+
+    @contextmanager
+    def recognizer(self, timeout=None):
+        rec = self.acquire(timeout=timeout)
+        try:
+            yield rec
+        finally:
+            self.release(rec)
+
+    def stats(self):
+        with self._lock:
+            out = dict(self._stats)
+            out["created"] = self._created
+        out["idle"] = self._idle.qsize()
+        out["size"] = self.size
+        return out
+
+    def _count(self, key):
+        with self._lock:
+            self._stats["checkouts"] += 1
+            self._stats[key] += 1
+
+
+_POOLS = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def get_recognizer_pool(model_path=None, size=None):
+    model_path = model_path or VOSK_MODEL_PATH
+    with _POOLS_LOCK:
+        pool = _POOLS.get(model_path)
+        if pool is None:
+            pool = RecognizerPool(model_path, size)
+            _POOLS[model_path] = pool
+        return pool
+
+
+def configure_asr(model_path=None, pool_size=None):
+    """Override the default model path / pool size (call before the first transcription)."""
+    global VOSK_MODEL_PATH, RECOGNIZER_POOL_SIZE
+    if model_path:
+        VOSK_MODEL_PATH = model_path
+    if pool_size:
+        RECOGNIZER_POOL_SIZE = pool_size
+    return get_recognizer_pool(VOSK_MODEL_PATH, RECOGNIZER_POOL_SIZE)
+
+
+def asr_stats():
+    with _POOLS_LOCK:
+        return {path: pool.stats() for path, pool in _POOLS.items()}
+
+
+def make_vad(**overrides):
+    params = dict(
+        rate=RATE,
+        end_of_utterance=END_OF_UTTERANCE,
+        hangover=VAD_HANGOVER,
+        start_timeout=START_TIMEOUT,
+        max_utterance=MAX_UTTERANCE,
+    )
+    params.update(overrides)
+    return VoiceActivityDetector(**params)
+
+
+class Microphone:
+    """
+    Input stream that can be opened ahead of time and started later.
+
+    Opening PortAudio is the slow part, so callers can open the mic while
+    the question is still being spoken and only start() it once playback
+    has finished (so the interviewer's own voice is not recorded).
+    """
+
+    def __init__(self):
+        self._audio = pyaudio.PyAudio()
+        self.stream = self._audio.open(format=FORMAT, channels=CHANNELS, rate=RATE,
+                                       input=True, frames_per_buffer=CHUNK, start=False)
+
+    def start(self):
+        if self.stream.is_stopped():
+            self.stream.start_stream()
+
+    def read(self):
+        return self.stream.read(CHUNK, exception_on_overflow=False)
+
+    def stop(self):
+        if not self.stream.is_stopped():
+            self.stream.stop_stream()
+
+    def close(self):
+        self.stop()
+        self.stream.close()
+        self._audio.terminate()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def capture_chunks(stop_event=None, vad=None, mic=None):
+    """
+    Open the microphone and yield raw 16 kHz mono int16 PCM chunks
+    until the VAD decides the candidate stopped talking (or stop_event is set).
+    A pre-opened Microphone can be passed in; it is stopped, not closed.
+    """
+    vad = vad or make_vad()
+    vad.reset()
+
+    own_mic = mic is None
+    mic = mic or Microphone()
+    mic.start()
+
+    try:
+        while True:
+            data = mic.read()
+            yield data
+
+            if vad.process(data):
+                break
+
+            if stop_event and stop_event.is_set():
                 break
+    finally:
+        if own_mic:
+            mic.close()
         else:
-            silent_start = None
+            mic.stop()
+
 
-        if stop_event and stop_event.is_set():
-            break
+def record_pcm(stop_event=None, vad=None, mic=None):
+    """Record one reply and return raw 16 kHz mono int16 PCM (no WAV wrapper)."""
+    return b"".join(capture_chunks(stop_event, vad, mic))
 
-    stream.stop_stream()
-    stream.close()
-    audio.terminate()
+
+def run_audio(stop_event=None, vad=None):
+    pcm = record_pcm(stop_event, vad)
 
     buffer = io.BytesIO()
     wf = wave.open(buffer, 'wb')
     wf.setnchannels(CHANNELS)
-    wf.setsampwidth(audio.get_sample_size(FORMAT))
+    wf.setsampwidth(pyaudio.get_sample_size(FORMAT))
     wf.setframerate(RATE)
-    wf.writeframes(b''.join(frames))
+    wf.writeframes(pcm)
     wf.close()
     buffer.seek(0)
 
     return buffer
 
-def transcribe_audio(buffer):
-    model = Model("vosk-model-small-en-us-0.15")
-    recognizer = KaldiRecognizer(model, 16000)
 
+# ------------------------------------------------------------------
+# STREAMING RECOGNITION
+# ------------------------------------------------------------------
+def stream_audio(stop_event=None, pool=None, vad=None, mic=None):
+    """
+    Decode the reply while the candidate is still talking.
+
+    Yields (kind, text) tuples:
+      ("partial", text) - running hypothesis for the current segment
+      ("final", text)   - a segment the recognizer has committed
+      ("done", text)    - full transcript, emitted once at end of speech
+    """
+    pool = pool or get_recognizer_pool()
+    final_text = []
+    last_partial = ""
+
+    with pool.recognizer() as recognizer:
+        for data in capture_chunks(stop_event, vad, mic):
+            if recognizer.AcceptWaveform(data):
+                text = json.loads(recognizer.Result()).get("text")
+                last_partial = ""
+                if text:
+                    final_text.append(text)
+                    yield "final", text
+            else:
+                partial = json.loads(recognizer.PartialResult()).get("partial", "")
+                if partial and partial != last_partial:
+                    last_partial = partial
+                    yield "partial", partial
+
+        text = json.loads(recognizer.FinalResult()).get("text")
+        if text:
+            final_text.append(text)
+            yield "final", text
+
+    text_out = " ".join(final_text).strip()
+    yield "done", text_out if text_out else "[NO SPEECH DETECTED]"
+
+
+def listen_and_transcribe(stop_event=None, on_partial=None, pool=None, vad=None, mic=None):
+    """Record one reply with streaming ASR and return the transcript as soon as speech ends."""
+    transcript = "[NO SPEECH DETECTED]"
+    for kind, text in stream_audio(stop_event, pool, vad, mic):
+        if kind == "done":
+            transcript = text
+        elif on_partial:
+            on_partial(kind, text)
+    return transcript
+
+# ------------------------------------------------------------------
+# OFFLINE TRANSCRIPTION
+# ------------------------------------------------------------------
+DECODE_FRAMES = 4000
+
+
+def transcribe_audio(buffer, pool=None):
+    """
+    Transcribe one recorded reply.
+
+    `buffer` may be a WAV/any-format file object (e.g. run_audio()'s BytesIO)
+    or encoded audio as bytes/bytearray/memoryview (WAV, MP3, OGG, ...).
+    WAV that is already in the recognizer's format is fed straight from the
+    caller's buffer; everything else goes through pydub/ffmpeg. Raw PCM
+    from record_pcm() has no header to check, so use transcribe_pcm().
+    """
+    pcm = _conformant_pcm(buffer)
+    if pcm is None:
+        pcm = _transcode(buffer)
+    return transcribe_pcm(pcm, pool)
+
+
+def transcribe_pcm(pcm, pool=None):
+    """Transcribe raw 16 kHz mono int16 PCM (e.g. record_pcm()) as-is."""
+    pool = pool or get_recognizer_pool()
+    with pool.recognizer() as recognizer:
+        return _decode(recognizer, memoryview(pcm).cast("B"))
+
+
+def _conformant_pcm(buffer):
+    """
+    Return a memoryview over the PCM payload when `buffer` is a WAV holding
+    16 kHz mono 16-bit PCM, otherwise None.
+    """
+    if isinstance(buffer, io.BytesIO):
+        view = buffer.getbuffer()[buffer.tell():]
+    elif isinstance(buffer, (bytes, bytearray, memoryview)):
+        view = memoryview(buffer).cast("B")
+    else:
+        return None
+
+    return _wav_payload(view)
+
+
+def _wav_payload(view):
+    if len(view) < 12 or view[:4] != b"RIFF" or view[8:12] != b"WAVE":
+        return None
+
+    fmt_ok = False
+    offset = 12
+    while offset + 8 <= len(view):
+        chunk_id = bytes(view[offset:offset + 4])
+        size = int.from_bytes(view[offset + 4:offset + 8], "little")
+        body = view[offset + 8:offset + 8 + size]
+
+        if chunk_id == b"fmt " and len(body) >= 16:
+            audio_format = int.from_bytes(body[0:2], "little")
+            channels = int.from_bytes(body[2:4], "little")
+            rate = int.from_bytes(body[4:8], "little")
+            bits = int.from_bytes(body[14:16], "little")
+            fmt_ok = (audio_format == 1 and channels == CHANNELS
+                      and rate == RATE and bits == 16)
+            if not fmt_ok:
+                return None
+        elif chunk_id == b"data":
+            return body if fmt_ok else None
+
+        offset += 8 + size + (size & 1)
+
+    return None
+
+
+def _transcode(buffer):
+    if isinstance(buffer, (bytes, bytearray, memoryview)):
+        buffer = io.BytesIO(buffer)
     audio = AudioSegment.from_file(buffer)
-    audio = audio.set_channels(1).set_frame_rate(16000).set_sample_width(2)
+    audio = audio.set_channels(CHANNELS).set_frame_rate(RATE).set_sample_width(2)
+    return memoryview(audio.raw_data)
 
-    buf = io.BytesIO()
-    audio.export(buf, format="wav")
-    buf.seek(0)
 
-    wf = wave.open(buf, "rb")
+def _decode(recognizer, pcm):
     final_text = []
+    step = DECODE_FRAMES * 2
 
-    while True:
-        data = wf.readframes(4000)
-        if len(data) == 0:
-            break
-        if recognizer.AcceptWaveform(data):
+    for offset in range(0, len(pcm), step):
+        # the cffi binding wants bytes, so only one block is materialized at a time
+        if recognizer.AcceptWaveform(pcm[offset:offset + step].tobytes()):
             result = json.loads(recognizer.Result())
             if result.get("text"):
                 final_text.append(result["text"])
@@ -84,4 +382,4 @@ def transcribe_audio(buffer):
         final_text.append(result["text"])
 
     text_out = " ".join(final_text).strip()
-    return text_out if text_out else "[NO SPEECH DETECTED]"
\ No newline at end of file
+    return text_out if text_out else "[NO SPEECH DETECTED]"
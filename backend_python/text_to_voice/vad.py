@@ -0,0 +1,161 @@
+import numpy as np
+
+# ------------------------------------------------------------------
+# ADAPTIVE VOICE ACTIVITY DETECTION
+# ------------------------------------------------------------------
+# Energy / zero-crossing VAD with a tracked noise floor. Features are
+# computed for every frame of a chunk at once in NumPy; only the small
+# per-frame state machine runs in Python.
+
+EPS = 1e-10
+
+
+def frame_features(samples: np.ndarray, frame_len: int):
+    """
+    Split int16 samples into frames and return (energy_db, zcr) arrays.
+    energy_db is in dBFS, zcr is the fraction of sign changes per frame.
+    Trailing samples that do not fill a frame are ignored.
+    """
+    n_frames = len(samples) // frame_len
+    if n_frames == 0:
+        return np.empty(0, dtype=np.float32), np.empty(0, dtype=np.float32)
+
+    frames = samples[: n_frames * frame_len].reshape(n_frames, frame_len)
+    x = frames.astype(np.float32) / 32768.0
+
+    energy_db = 10.0 * np.log10(np.mean(x * x, axis=1) + EPS)
+    signs = np.signbit(frames)
+    zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / (frame_len - 1)
+    return energy_db, zcr.astype(np.float32)
+
+
+class VoiceActivityDetector:
+    """
+    Decides when the candidate has finished answering.
+
+    - noise floor is calibrated from the first `calibration` seconds and then
+      tracked (fast down, slow up, very slow creep during speech), so a noisy room
+      raises the threshold instead of keeping the mic open forever. The mic
+      starts the moment playback ends, so the candidate may already be
+      talking: the initial floor is capped at min_speech_db - margin_db and
+      never calibrated on their voice
+    - a frame is speech when it is `margin_db` above the floor; quieter
+      frames with a high zero-crossing rate (fricatives) count too, so word
+      onsets and tails are not clipped
+    - `hangover` keeps short gaps inside a sentence from counting as silence
+    - the utterance ends after `end_of_utterance` seconds of silence (counted
+      after the hangover, so the tail is roughly hangover + end_of_utterance) once
+      at least `min_speech` seconds of speech were heard, after
+      `start_timeout` seconds if nobody speaks, or at `max_utterance`
+    """
+
+    def __init__(self, rate=16000, frame_ms=16, end_of_utterance=0.5,
+                 hangover=0.2, start_timeout=8.0, max_utterance=120.0,
+                 margin_db=10.0, min_speech_db=-50.0, calibration=0.25,
+                 min_speech=0.15, zcr_threshold=0.25):
+        self.rate = rate
+        self.frame_len = max(1, int(rate * frame_ms / 1000))
+        self.frame_sec = self.frame_len / rate
+
+        self.end_of_utterance = end_of_utterance
+        self.hangover_frames = int(round(hangover / self.frame_sec))
+        self.start_timeout = start_timeout
+        self.max_utterance = max_utterance
+        self.margin_db = margin_db
+        self.min_speech_db = min_speech_db
+        self.calibration_frames = max(1, int(round(calibration / self.frame_sec)))
+        self.min_speech_frames = max(1, int(round(min_speech / self.frame_sec)))
+        self.zcr_threshold = zcr_threshold
+
+        # noise floor smoothing per frame; floor_creep lets the floor follow
+        # a noise source that starts mid-answer and would otherwise look
+        # like endless speech
+        self.floor_down = 0.5
+        self.floor_up = 0.01
+        self.floor_creep = 0.002
+
+        self.reset()
+
+    def reset(self):
+        self.noise_floor_db = None
+        self._calibration = []
+        self._pending = np.empty(0, dtype=np.int16)
+        self._hang = 0
+        self._speech_run = 0
+        self._silence_frames = 0
+        self.frames_seen = 0
+        self.in_speech = False
+        self.speech_started = False
+        self.finished = False
+
+    @property
+    def elapsed(self):
+        return self.frames_seen * self.frame_sec
+
+    @property
+    def trailing_silence(self):
+        return self._silence_frames * self.frame_sec
+
+    def process(self, chunk) -> bool:
+        """Feed one PCM chunk (bytes or int16 array). Returns True once the utterance is over."""
+        if self.finished:
+            return True
+
+        samples = chunk
+        if isinstance(chunk, (bytes, bytearray, memoryview)):
+            samples = np.frombuffer(chunk, dtype=np.int16)
+        if len(self._pending):
+            samples = np.concatenate((self._pending, samples))
+
+        energy_db, zcr = frame_features(samples, self.frame_len)
+        used = len(energy_db) * self.frame_len
+        self._pending = samples[used:].copy()
+
+        for e, z in zip(energy_db.tolist(), zcr.tolist()):
+            if self._update(e, z):
+                self.finished = True
+                break
+
+        return self.finished
+
+    def _update(self, energy_db, zcr):
+        self.frames_seen += 1
+
+        if self.noise_floor_db is None:
+            self._calibration.append(energy_db)
+            if len(self._calibration) < self.calibration_frames:
+                return False
+            self.noise_floor_db = min(float(np.percentile(self._calibration, 20)),
+                                      self.min_speech_db - self.margin_db)
+            self._calibration = []
+
+        threshold = max(self.noise_floor_db + self.margin_db, self.min_speech_db)
+        raw_speech = energy_db >= threshold or (
+            energy_db >= threshold - self.margin_db / 2 and zcr >= self.zcr_threshold
+        )
+
+        if raw_speech:
+            self._hang = self.hangover_frames
+            self._speech_run += 1
+            self.noise_floor_db += self.floor_creep * (energy_db - self.noise_floor_db)
+        else:
+            self._speech_run = 0
+            if self._hang > 0:
+                self._hang -= 1
+            alpha = self.floor_down if energy_db < self.noise_floor_db else self.floor_up
+            self.noise_floor_db += alpha * (energy_db - self.noise_floor_db)
+
+        self.in_speech = raw_speech or self._hang > 0
+        if self._speech_run >= self.min_speech_frames:
+            self.speech_started = True
+
+        if self.in_speech:
+            self._silence_frames = 0
+        else:
+            self._silence_frames += 1
+
+        if self.elapsed >= self.max_utterance:
+            return True
+        if self.speech_started:
+            return self.trailing_silence >= self.end_of_utterance
+        return self.elapsed >= self.start_timeout
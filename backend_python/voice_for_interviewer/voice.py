@@ -1,26 +1,373 @@
-import pyttsx3
+import hashlib
+import os
+import queue
+import tempfile
 import threading
+import wave
+from collections import OrderedDict
+from concurrent.futures import CancelledError, Future
+from pathlib import Path
+
+import pyaudio
+import pyttsx3
+
+PLAYBACK_CHUNK = 1024
+
+TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", str(Path(__file__).parent / "tts_cache"))
+TTS_CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_MB", "50")) * 1024 * 1024
+# suffix of renders not (yet) moved into the cache; never indexed as entries
+TMP_SUFFIX = ".wav.tmp"
+
+
+class SpeechCache:
+    """
+    Size-bounded LRU cache of rendered WAV files on disk.
+
+    Entries are keyed by a hash of (text, rate, volume, voice), so a line
+    rendered once is reused across interviews and process restarts. File
+    mtimes record recency; the oldest files are evicted once the directory
+    grows past max_bytes.
+    """
+
+    def __init__(self, cache_dir=TTS_CACHE_DIR, max_bytes=TTS_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+        entries = []
+        for name in os.listdir(cache_dir):
+            if name.endswith(".wav"):
+                st = os.stat(os.path.join(cache_dir, name))
+                entries.append((st.st_mtime, name[:-4], st.st_size))
+        self._index = OrderedDict((key, size) for _, key, size in sorted(entries))
+        self._total = sum(self._index.values())
+
+    @staticmethod
+    def key(text, rate, volume, voice_id):
+        raw = f"{text}\x00{rate}\x00{volume}\x00{voice_id or ''}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.wav")
+
+    def get(self, key):
+        with self.lock:
+            if key not in self._index:
+                self.misses += 1
+                return None
+            path = self._path(key)
+            try:
+                os.utime(path)
+            except OSError:
+                self._total -= self._index.pop(key)
+                self.misses += 1
+                return None
+            self._index.move_to_end(key)
+            self.hits += 1
+            return path
+
+    def put(self, key, src_path):
+        """Move a freshly rendered WAV into the cache and return its cached path."""
+        path = self._path(key)
+        os.replace(src_path, path)
+        size = os.path.getsize(path)
+        with self.lock:
+            self._total -= self._index.pop(key, 0)
+            self._index[key] = size
+            self._total += size
+            self._evict(keep=key)
+        return path
+
+    def _evict(self, keep):
+        for key in list(self._index):
+            if self._total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+            except OSError:
+                continue  # still open for playback (Windows); retry next time
+            self._total -= self._index.pop(key)
+
+    def stats(self):
+        with self.lock:
+            return {
+                "entries": len(self._index),
+                "bytes": self._total,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
 
 class VoiceEngine:
-    def __init__(self):
+    """
+    Long-lived text-to-speech worker.
+
+    One background thread owns a single pyttsx3 engine (engines are not
+    thread-safe) and renders queued lines to WAV files as soon as they are
+    queued; a second thread plays them back in order. Line N+1 is therefore
+    synthesized while line N is still playing, and the caller never pays
+    engine init per line. Rendered lines go through a SpeechCache, so fixed
+    lines (farewell, cancellation notice) are played straight from disk and
+    can be rendered ahead of time with prewarm().
+
+      voice.speak(text)        - blocking, same as before
+      voice.speak_async(text)  - returns a Future resolved after playback
+      voice.prewarm(lines)     - render lines into the cache without playing them
+      voice.wait()             - block until everything queued has been spoken
+      voice.stop()             - drop queued lines and cut the current one
+      voice.close()            - stop and shut the worker threads down
+    """
+
+    def __init__(self, rate=170, volume=1.0, voice_id=None, presynthesize=True, cache=None):
         self.lock = threading.Lock()
+        self.rate = rate
+        self.volume = volume
+        self.voice_id = voice_id
+        self.presynthesize = presynthesize
+        self.cache = cache if cache is not None else SpeechCache()
 
-    def speak(self, text: str):
+        self._jobs = queue.Queue()
+        self._playback = queue.Queue()
+        self._interrupt = threading.Event()
+        self._closed = False
+        self._pending = 0
+        self._error = None  # set if the TTS engine could not be created
+        self._idle = threading.Condition(self.lock)
+
+        self._synth_thread = threading.Thread(target=self._synth_loop, daemon=True)
+        self._play_thread = threading.Thread(target=self._play_loop, daemon=True)
+        self._synth_thread.start()
+        self._play_thread.start()
+
+    # ---------------- public API ----------------
+
+    def speak_async(self, text: str) -> Future:
+        return self._submit(text, play=True)
+
+    def prewarm(self, lines):
+        """Render lines into the speech cache in the background; returns their futures."""
+        return [self._submit(text, play=False) for text in lines]
+
+    def _submit(self, text, play):
+        future = Future()
         if not text or not text.strip():
+            future.set_result(None)
+            return future
+
+        with self.lock:
+            if self._closed:
+                raise RuntimeError("VoiceEngine is closed")
+            if self._error is not None:
+                raise self._error
+            self._pending += 1
+        if play:
+            self._interrupt.clear()
+        self._jobs.put((text, play, future))
+        return future
+
+    def speak(self, text: str):
+        try:
+            return self.speak_async(text).result()
+        except CancelledError:
+            return None
+
+    def wait(self, timeout=None) -> bool:
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+
+    def stop(self):
+        self._interrupt.set()
+        for q in (self._jobs, self._playback):
+            sentinel = False
+            while True:
+                try:
+                    item = q.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    sentinel = True
+                else:
+                    self._finish(item[-1], cancelled=True)
+                if q is self._playback:
+                    q.task_done()
+            if sentinel:
+                q.put(None)
+
+    def close(self):
+        with self.lock:
+            if self._closed:
+                return
+            self._closed = True
+        self.stop()
+        self._jobs.put(None)
+        self._synth_thread.join()
+        self._play_thread.join()
+
+    # ---------------- worker threads ----------------
+
+    def _new_engine(self):
+        engine = pyttsx3.init()
+        engine.setProperty("rate", self.rate)
+        engine.setProperty("volume", self.volume)
+        if self.voice_id:
+            engine.setProperty("voice", self.voice_id)
+        return engine
+
+    def _synth_loop(self):
+        try:
+            engine = self._new_engine()
+        except Exception as e:
+            print("❌ TTS engine failed to start:", e)
+            self._fail_jobs(e)
             return
 
+        try:
+            while True:
+                job = self._jobs.get()
+                if job is None:
+                    self._playback.put(None)
+                    break
+
+                text, play, future = job
+                if future.done():
+                    self._finish(future)
+                    continue
+
+                path = self._cached_render(engine, text) if self.presynthesize else None
+                if not play:
+                    self._finish(future)
+                    continue
+                if path:
+                    self._playback.put((path, future))
+                    continue
+
+                # no WAV (driver cannot save, or presynthesis off): speak
+                # directly once everything queued before this line has played
+                self._playback.join()
+                if self._interrupt.is_set():
+                    self._finish(future, cancelled=True)
+                    continue
+                try:
+                    engine.say(text)
+                    engine.runAndWait()
+                    self._finish(future)
+                except Exception as e:
+                    self._finish(future, error=e)
+        finally:
+            engine.stop()
+
+    def _fail_jobs(self, error):
+        """Without an engine: fail every queued and future line until close(), then stop playback."""
         with self.lock:
-            engine = pyttsx3.init()
-            engine.setProperty("rate", 170)
-            engine.setProperty("volume", 1.0)
+            self._error = error
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            self._finish(job[-1], error=error)
+        self._playback.put(None)
+
+    def _cached_render(self, engine, text):
+        key = SpeechCache.key(text, self.rate, self.volume, self.voice_id)
+        path = self.cache.get(key)
+        if path:
+            return path
+        path = self._render(engine, text)
+        if path:
+            try:
+                path = self.cache.put(key, path)
+            except OSError as e:
+                print("⚠️ Could not store line in TTS cache:", e)
+        return path
 
-            engine.say(text)
+    def _render(self, engine, text):
+        # render next to the cache so put() is a same-directory rename (a
+        # temp dir on another drive would make os.replace fail with EXDEV)
+        fd, path = tempfile.mkstemp(dir=self.cache.cache_dir, suffix=TMP_SUFFIX)
+        os.close(fd)
+        try:
+            engine.save_to_file(text, path)
             engine.runAndWait()
+            with wave.open(path, "rb"):
+                pass
+            return path
+        except Exception as e:
+            print("⚠️ TTS pre-synthesis failed, speaking directly:", e)
+            self._discard(path)
+            return None
+
+    def _play_loop(self):
+        audio = pyaudio.PyAudio()
+        try:
+            while True:
+                item = self._playback.get()
+                try:
+                    if item is None:
+                        break
+                    path, future = item
+                    if future.done():
+                        self._finish(future)
+                        continue
+                    try:
+                        self._play_wav(audio, path)
+                        self._finish(future, cancelled=self._interrupt.is_set())
+                    except Exception as e:
+                        self._finish(future, error=e)
+                    finally:
+                        self._release(path)
+                finally:
+                    self._playback.task_done()
+        finally:
+            audio.terminate()
+
+    def _play_wav(self, audio, path):
+        with wave.open(path, "rb") as wf:
+            stream = audio.open(
+                format=audio.get_format_from_width(wf.getsampwidth()),
+                channels=wf.getnchannels(),
+                rate=wf.getframerate(),
+                output=True,
+            )
+            try:
+                data = wf.readframes(PLAYBACK_CHUNK)
+                while data and not self._interrupt.is_set():
+                    stream.write(data)
+                    data = wf.readframes(PLAYBACK_CHUNK)
+            finally:
+                stream.stop_stream()
+                stream.close()
+
+    def _release(self, path):
+        # cached renders stay on disk; only uncached temp files are removed
+        if path.endswith(TMP_SUFFIX):
+            self._discard(path)
+
+    def _discard(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _finish(self, future, cancelled=False, error=None):
+        if not future.done():
+            if cancelled:
+                future.cancel()
+            elif error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(None)
+        with self._idle:
+            self._pending -= 1
+            self._idle.notify_all()
 
-            engine.stop()
 
-    def stop(self):
-        pass
 # import pyttsx3
 # import threading
 